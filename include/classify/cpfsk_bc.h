@@ -32,6 +32,11 @@ namespace gr {
      * \brief <+description of block+>
      * \ingroup classify
      *
+     * With \p use_nco the phase is a 32-bit fixed-point accumulator that
+     * wraps on overflow, and each sample is a lookup in a sine table of
+     * 2^\p nco_table_bits entries. The phase is then exactly periodic with
+     * no drift, at the cost of phase truncation spurs near
+     * -6 * nco_table_bits dBc.
      */
     class CLASSIFY_API cpfsk_bc : virtual public gr::sync_interpolator
     {
@@ -46,7 +51,8 @@ namespace gr {
        * class. classify::cpfsk_bc::make is the public interface for
        * creating new instances.
        */
-      static sptr make(float k, float ampl, int samples_per_sym, int bits_per_symbol);
+      static sptr make(float k, float ampl, int samples_per_sym, int bits_per_symbol,
+                       bool use_nco=false, int nco_table_bits=10);
       virtual void set_amplitude(float amplitude) = 0;
       virtual float freq() = 0;
       virtual float amplitude() = 0;
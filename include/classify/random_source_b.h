@@ -0,0 +1,63 @@
+/* -*- c++ -*- */
+/* 
+ * Copyright 2018 University of Arizona.
+ * 
+ * This is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 3, or (at your option)
+ * any later version.
+ * 
+ * This software is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ * 
+ * You should have received a copy of the GNU General Public License
+ * along with this software; see the file COPYING.  If not, write to
+ * the Free Software Foundation, Inc., 51 Franklin Street,
+ * Boston, MA 02110-1301, USA.
+ */
+
+
+#ifndef INCLUDED_CLASSIFY_RANDOM_SOURCE_B_H
+#define INCLUDED_CLASSIFY_RANDOM_SOURCE_B_H
+
+#include <classify/api.h>
+#include <gnuradio/sync_block.h>
+
+namespace gr {
+  namespace classify {
+
+    /*!
+     * \brief Endless stream of uniformly distributed random bytes
+     * \ingroup classify
+     *
+     * Bytes are drawn from a Mersenne Twister seeded with \p seed, so
+     * two sources with the same seed produce the same stream and the
+     * stream never repeats within a capture. Every 32-bit draw gives four
+     * bytes, least significant first, whatever the scheduler's buffer
+     * sizes.
+     */
+    class CLASSIFY_API random_source_b : virtual public gr::sync_block
+    {
+     public:
+      typedef boost::shared_ptr<random_source_b> sptr;
+
+      /*!
+       * \brief Return a shared_ptr to a new instance of classify::random_source_b.
+       *
+       * To avoid accidental use of raw pointers, classify::random_source_b's
+       * constructor is in a private implementation
+       * class. classify::random_source_b::make is the public interface for
+       * creating new instances.
+       */
+      static sptr make(unsigned int seed);
+      virtual void set_seed(unsigned int seed) = 0;
+      virtual unsigned int seed() = 0;
+    };
+
+  } // namespace classify
+} // namespace gr
+
+#endif /* INCLUDED_CLASSIFY_RANDOM_SOURCE_B_H */
+
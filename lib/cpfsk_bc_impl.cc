@@ -23,27 +23,39 @@
 #endif
 
 #include <gnuradio/io_signature.h>
-#include <gnuradio/expj.h>
+#include <volk/volk.h>
 #include <math.h>
 #include "cpfsk_bc_impl.h"
 #include <iostream>
+#include <stdexcept>
 
 namespace gr {
   namespace classify {
 
     #define M_TWOPI (2*M_PI)
 
+    static int
+    checked_table_bits(int nco_table_bits)
+    {
+      if(nco_table_bits < 1 || nco_table_bits > 24)
+        throw std::invalid_argument("cpfsk_bc: nco_table_bits must be in [1, 24]");
+      return nco_table_bits;
+    }
+
     cpfsk_bc::sptr
-    cpfsk_bc::make(float k, float ampl, int samples_per_sym, int bits_per_symbol)
+    cpfsk_bc::make(float k, float ampl, int samples_per_sym, int bits_per_symbol,
+                   bool use_nco, int nco_table_bits)
     {
       return gnuradio::get_initial_sptr
-        (new cpfsk_bc_impl(k, ampl, samples_per_sym, bits_per_symbol));
+        (new cpfsk_bc_impl(k, ampl, samples_per_sym, bits_per_symbol,
+                           use_nco, nco_table_bits));
     }
 
     /*
      * The private constructor
      */
-    cpfsk_bc_impl::cpfsk_bc_impl(float k, float ampl, int samples_per_sym, int bits_per_symbol)
+    cpfsk_bc_impl::cpfsk_bc_impl(float k, float ampl, int samples_per_sym, int bits_per_symbol,
+                                 bool use_nco, int nco_table_bits)
       : gr::sync_interpolator("cpfsk_bc",
               gr::io_signature::make(1, 1, sizeof(char)),
               gr::io_signature::make(1, 1, sizeof(gr_complex)), samples_per_sym),
@@ -51,9 +63,41 @@ namespace gr {
       d_freq(k*M_PI/(samples_per_sym*bits_per_symbol)),
       d_ampl(ampl),
       d_phase(0.0),
-      d_mid(pow(2, (bits_per_symbol - 1)))
+      d_mid(pow(2, (bits_per_symbol - 1))),
+      d_ramp(samples_per_sym),
+      d_use_nco(use_nco),
+      // Checked before any shift by it; d_nco_round follows from the shift
+      d_nco_shift(32 - checked_table_bits(nco_table_bits)),
+      d_nco_round(1u << (d_nco_shift - 1)),
+      d_acc(0)
     {
+      // Symbols are offsets from d_mid, skipping zero:
+      // ..., -2, -1, +1, +2, ... times d_freq
+      for(int b = 0; b < 256; b++){
+        int sym = (char) b;
+        if(sym >= d_mid){
+          d_incr[b] = (sym - d_mid + 1)*d_freq;
+        }
+        else{
+          d_incr[b] = -(d_mid - sym)*d_freq;
+        }
+      }
+      for(int j = 0; j < d_samples_per_sym; j++){
+        d_ramp[j] = j + 1;
+      }
 
+      // Steps as fractions of a turn in 32-bit words; two's complement
+      // wrap makes negative steps count down
+      for(int b = 0; b < 256; b++){
+        d_step[b] = (boost::uint32_t) (boost::int64_t) llrint(d_incr[b]/M_TWOPI*4294967296.0);
+      }
+      if(d_use_nco){
+        d_table.resize(1 << nco_table_bits);
+        for(size_t i = 0; i < d_table.size(); i++){
+          double angle = M_TWOPI*i/d_table.size();
+          d_table[i] = gr_complex(cos(angle), sin(angle));
+        }
+      }
     }
 
     /*
@@ -63,6 +107,14 @@ namespace gr {
     {
     }
 
+    float
+    cpfsk_bc_impl::phase()
+    {
+      if(d_use_nco)
+        return d_acc*(M_TWOPI/4294967296.0);
+      return d_phase;
+    }
+
     int
     cpfsk_bc_impl::work(int noutput_items,
         gr_vector_const_void_star &input_items,
@@ -71,24 +123,45 @@ namespace gr {
       const char *in = (const char *) input_items[0];
       gr_complex *out = (gr_complex *) output_items[0];
 
-      // Do <+signal processing+>
-      
-      for(int i = 0; i < noutput_items/d_samples_per_sym; i++){
-        for(int j = 0; j < d_samples_per_sym; j++){
-          if(in[i] >= d_mid){
-            d_phase += (in[i] - d_mid + 1)*d_freq;
-          }
-          else{
-            d_phase -= (d_mid - in[i])*d_freq;
+      if(d_use_nco){
+        for(int i = 0; i < noutput_items/d_samples_per_sym; i++){
+          const boost::uint32_t step = d_step[(unsigned char) in[i]];
+          for(int j = 0; j < d_samples_per_sym; j++){
+            d_acc += step;
+            // Round to the nearest entry, wrapping past the last one
+            *out++ = d_table[(boost::uint32_t) (d_acc + d_nco_round) >> d_nco_shift]*d_ampl;
           }
+        }
+        return noutput_items;
+      }
 
-          while(d_phase > M_TWOPI) d_phase -= M_TWOPI;
-          while(d_phase < M_TWOPI) d_phase += M_TWOPI;
+      if((int) d_phases.size() < noutput_items){
+        d_phases.resize(noutput_items);
+        d_cos.resize(noutput_items);
+        d_sin.resize(noutput_items);
+      }
 
-          *out++ = gr_expj(d_phase)*d_ampl;
+      // Phase ramp of every symbol from its step. One fmod per symbol keeps
+      // d_phase in [0, 2pi) however large the step, so no ramp is more than
+      // one symbol's worth of phase away from that range. The running phase
+      // is double: a float one loses up to half an ulp per symbol, and
+      // wrapping by a float 2pi biases that into a steady drift
+      float *phase = &d_phases[0];
+      for(int i = 0; i < noutput_items/d_samples_per_sym; i++){
+        const double incr = d_incr[(unsigned char) in[i]];
+        for(int j = 0; j < d_samples_per_sym; j++){
+          *phase++ = d_phase + d_ramp[j]*incr;
         }
+        d_phase = fmod(d_phase + d_samples_per_sym*incr, M_TWOPI);
+        if(d_phase < 0) d_phase += M_TWOPI;
       }
 
+      // All the trig of this call in a few vector kernels
+      volk_32f_cos_32f(&d_cos[0], &d_phases[0], noutput_items);
+      volk_32f_sin_32f(&d_sin[0], &d_phases[0], noutput_items);
+      volk_32f_x2_interleave_32fc(out, &d_cos[0], &d_sin[0], noutput_items);
+      volk_32fc_s32fc_multiply_32fc(out, out, lv_cmake(d_ampl, 0.0f), noutput_items);
+
       // Tell runtime system how many output items we produced.
       return noutput_items;
     }
@@ -22,6 +22,8 @@
 #define INCLUDED_CLASSIFY_CPFSK_BC_IMPL_H
 
 #include <classify/cpfsk_bc.h>
+#include <vector>
+#include <boost/cstdint.hpp>
 
 namespace gr {
   namespace classify {
@@ -31,18 +33,32 @@ namespace gr {
      private:
       int d_samples_per_sym;
       int d_mid;
-      float d_freq;
+      double d_freq;
       float d_ampl;
-      float d_phase;
+      double d_phase;               // kept in double so wrapping never drifts
+      double d_incr[256];           // phase step of each input byte
+      std::vector<float> d_ramp;    // 1, 2, ..., samples_per_sym
+      std::vector<float> d_phases;  // per sample phases of one call
+      std::vector<float> d_cos;
+      std::vector<float> d_sin;
+
+      // Fixed-point NCO mode
+      bool d_use_nco;
+      int d_nco_shift;                 // 32 - nco_table_bits
+      boost::uint32_t d_nco_round;     // half a table step
+      boost::uint32_t d_acc;           // phase, 2^32 is one turn
+      boost::uint32_t d_step[256];     // d_incr as phase words
+      std::vector<gr_complex> d_table; // exp(j*2pi*i/table size)
  
      public:
-      cpfsk_bc_impl(float k, float ampl, int samples_per_sym, int bits_per_symbol);
+      cpfsk_bc_impl(float k, float ampl, int samples_per_sym, int bits_per_symbol,
+                    bool use_nco, int nco_table_bits);
       ~cpfsk_bc_impl();
 
       void set_amplitude(float amplitude) { d_ampl = amplitude; }
       float amplitude() { return d_ampl; }
       float freq() { return d_freq; }
-      float phase() { return d_phase; }
+      float phase();
 
       // Where all the action really happens
       int work(int noutput_items,
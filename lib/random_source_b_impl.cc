@@ -0,0 +1,98 @@
+/* -*- c++ -*- */
+/* 
+ * Copyright 2018 University of Arizona.
+ * 
+ * This is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 3, or (at your option)
+ * any later version.
+ * 
+ * This software is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ * 
+ * You should have received a copy of the GNU General Public License
+ * along with this software; see the file COPYING.  If not, write to
+ * the Free Software Foundation, Inc., 51 Franklin Street,
+ * Boston, MA 02110-1301, USA.
+ */
+
+#ifdef HAVE_CONFIG_H
+#include "config.h"
+#endif
+
+#include <gnuradio/io_signature.h>
+#include <boost/cstdint.hpp>
+#include "random_source_b_impl.h"
+
+namespace gr {
+  namespace classify {
+
+    random_source_b::sptr
+    random_source_b::make(unsigned int seed)
+    {
+      return gnuradio::get_initial_sptr
+        (new random_source_b_impl(seed));
+    }
+
+    /*
+     * The private constructor
+     */
+    random_source_b_impl::random_source_b_impl(unsigned int seed)
+      : gr::sync_block("random_source_b",
+              gr::io_signature::make(0, 0, 0),
+              gr::io_signature::make(1, 1, sizeof(unsigned char))),
+      d_seed(seed),
+      d_rng(seed),
+      d_word(0),
+      d_word_bytes(0)
+    {
+
+    }
+
+    /*
+     * Our virtual destructor.
+     */
+    random_source_b_impl::~random_source_b_impl()
+    {
+    }
+
+    int
+    random_source_b_impl::work(int noutput_items,
+        gr_vector_const_void_star &input_items,
+        gr_vector_void_star &output_items)
+    {
+      unsigned char *out = (unsigned char *) output_items[0];
+
+      // Bytes left over from the word drawn by the previous call, so the
+      // stream does not depend on how the scheduler splits it up
+      int i = 0;
+      for(; d_word_bytes > 0 && i < noutput_items; i++, d_word_bytes--){
+        out[i] = d_word & 0xff;
+        d_word >>= 8;
+      }
+      // Each 32-bit draw supplies four output bytes
+      for(; i + 4 <= noutput_items; i += 4){
+        boost::uint32_t word = d_rng();
+        out[i] = word & 0xff;
+        out[i+1] = (word >> 8) & 0xff;
+        out[i+2] = (word >> 16) & 0xff;
+        out[i+3] = word >> 24;
+      }
+      if(i < noutput_items){
+        d_word = d_rng();
+        d_word_bytes = 4;
+        for(; i < noutput_items; i++, d_word_bytes--){
+          out[i] = d_word & 0xff;
+          d_word >>= 8;
+        }
+      }
+
+      // Tell runtime system how many output items we produced.
+      return noutput_items;
+    }
+
+  } /* namespace classify */
+} /* namespace gr */
+
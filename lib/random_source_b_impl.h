@@ -0,0 +1,56 @@
+/* -*- c++ -*- */
+/* 
+ * Copyright 2018 University of Arizona.
+ * 
+ * This is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 3, or (at your option)
+ * any later version.
+ * 
+ * This software is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ * 
+ * You should have received a copy of the GNU General Public License
+ * along with this software; see the file COPYING.  If not, write to
+ * the Free Software Foundation, Inc., 51 Franklin Street,
+ * Boston, MA 02110-1301, USA.
+ */
+
+#ifndef INCLUDED_CLASSIFY_RANDOM_SOURCE_B_IMPL_H
+#define INCLUDED_CLASSIFY_RANDOM_SOURCE_B_IMPL_H
+
+#include <classify/random_source_b.h>
+#include <boost/random/mersenne_twister.hpp>
+#include <boost/cstdint.hpp>
+
+namespace gr {
+  namespace classify {
+
+    class random_source_b_impl : public random_source_b
+    {
+     private:
+      unsigned int d_seed;
+      boost::random::mt19937 d_rng;
+      boost::uint32_t d_word;
+      int d_word_bytes;
+
+     public:
+      random_source_b_impl(unsigned int seed);
+      ~random_source_b_impl();
+
+      void set_seed(unsigned int seed) { d_seed = seed; d_rng.seed(seed); d_word_bytes = 0; }
+      unsigned int seed() { return d_seed; }
+
+      // Where all the action really happens
+      int work(int noutput_items,
+         gr_vector_const_void_star &input_items,
+         gr_vector_void_star &output_items);
+    };
+
+  } // namespace classify
+} // namespace gr
+
+#endif /* INCLUDED_CLASSIFY_RANDOM_SOURCE_B_IMPL_H */
+
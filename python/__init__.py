@@ -33,6 +33,13 @@ except ImportError:
 # import any pure python here
 from data_source import *
 from channel import *
-from generate_dataset import generate_dataset
+from generate_dataset import generate_dataset, iter_dataset
+from dataset_builder import dataset_builder
+from iq_dataset import iq_dataset
+from sigmf_io import sigmf_recording, recordings_to_dataset
+from dataset_writer import get_writer, write_dataset
+from dataset_reader import dataset_reader
+from batch_source import get_batch_source
+from batch_channel import apply_channel
 import constellations
 #
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 
+# Copyright 2018 University of Arizona.
+# 
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+# 
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+
+import numpy as np
+
+
+'''
+Vectorized counterparts of the channels in channel.py. Every function
+takes a (batch, n) complex array and applies an independent realization
+of the impairment to each row.
+'''
+def noise_amplitude(snr_db):
+    # Same noise amplitude as channel
+    return np.sqrt(10.0 ** (-np.asarray(snr_db, dtype=np.float64) / 10.0))
+
+
+def awgn(iq, snr_db, rng=None):
+    '''
+    Adds complex Gaussian noise of total variance noise_amplitude(snr_db)**2,
+    split evenly between I and Q like noise_source_c
+    '''
+    rng = np.random if rng is None else rng
+    noise = rng.standard_normal(iq.shape + (2,)).astype(np.float32).view(np.complex64)[..., 0]
+    return iq + noise*np.float32(noise_amplitude(snr_db)/np.sqrt(2.0))
+
+
+def jakes(batch_size, num_samples, n_sinusoids=8, max_doppler=1.0/200e3, rng=None):
+    '''
+    (batch, n) complex gains from the sum of sinusoids model of
+    channels.fading_model (NLOS), with random angle and phases per row
+    '''
+    rng = np.random if rng is None else rng
+    n = np.arange(1, n_sinusoids + 1)
+    theta = rng.uniform(-np.pi, np.pi, size=(batch_size, 1, 1))
+    alpha = (2*np.pi*n[:, np.newaxis] - np.pi + theta)/(4*n_sinusoids)
+    psi = rng.uniform(-np.pi, np.pi, size=(batch_size, n_sinusoids, 1))
+    phi = rng.uniform(-np.pi, np.pi, size=(batch_size, n_sinusoids, 1))
+    doppler = 2*np.pi*max_doppler*np.arange(num_samples)
+    h_i = np.cos(psi + doppler*np.cos(alpha)).sum(axis=1)
+    h_q = np.cos(phi + doppler*np.sin(alpha)).sum(axis=1)
+    return (np.sqrt(2.0/n_sinusoids)*(h_i + 1j*h_q)).astype(np.complex64)
+
+
+def flat_fading(iq, n_sinusoids=8, max_doppler=1.0/200e3, rng=None):
+    return iq*jakes(iq.shape[0], iq.shape[-1], n_sinusoids, max_doppler, rng)
+
+
+def selective_fading(iq, n_sinusoids=8, max_doppler=1.0/200e3,
+                     delays=(0.0, 0.9, 1.7), mags=(1, 0.8, 0.3), ntaps=8, rng=None):
+    '''
+    Tapped delay line of channels.selective_fading_model: one Jakes fader
+    per PDP path, spread over ntaps taps by sinc interpolation of its delay.
+    The output drops the first ntaps - 1 samples, which have no full
+    history, so it is ntaps - 1 samples shorter than iq.
+    '''
+    num_out = iq.shape[-1] - (ntaps - 1)
+    taps = np.zeros((iq.shape[0], num_out, ntaps), dtype=np.complex64)
+    for delay, mag in zip(delays, mags):
+        gain = jakes(iq.shape[0], num_out, n_sinusoids, max_doppler, rng)
+        taps += gain[:, :, np.newaxis]*(mag*np.sinc(np.arange(ntaps) - delay)).astype(np.float32)
+    out = np.zeros((iq.shape[0], num_out), dtype=np.complex64)
+    for k in range(ntaps):
+        out += taps[:, :, k]*iq[:, ntaps - 1 - k:ntaps - 1 - k + num_out]
+    return out
+
+
+def channel_history(channel_string):
+    '''
+    Number of extra input samples apply_channel consumes per row
+    '''
+    if channel_string == "selective_fading":
+        return 7
+    return 0
+
+
+def fade(channel_string, iq, rng=None):
+    '''
+    Everything get_channel(channel_string) does to iq except the noise
+    '''
+    if channel_string in ("", "awgn"):
+        return iq
+    elif channel_string == "flat_fading":
+        return flat_fading(iq, rng=rng)
+    elif channel_string == "selective_fading":
+        return selective_fading(iq, rng=rng)
+    raise ValueError("No batch model for channel %s" % channel_string)
+
+
+def apply_channel(channel_string, iq, snr_db, rng=None):
+    '''
+    Batch version of get_channel(channel_string, snr_db) applied to iq. The
+    output is channel_history(channel_string) samples shorter than iq.
+    '''
+    faded = fade(channel_string, iq, rng)
+    if channel_string == "":
+        return faded
+    return awgn(faded, snr_db, rng)
+
+
+def apply_channel_sweep(channel_string, iq, snr_vals, rng=None):
+    '''
+    apply_channel for every SNR in snr_vals at once, returned as an array of
+    shape (len(snr_vals),) + faded shape. The fading realization and one
+    unit variance noise draw are shared by all SNRs; only the broadcast
+    noise amplitude differs.
+    '''
+    rng = np.random if rng is None else rng
+    faded = fade(channel_string, iq, rng)
+    if channel_string == "":
+        return np.broadcast_to(faded, (len(snr_vals),) + faded.shape)
+    noise = awgn(np.zeros_like(faded), 0, rng)
+    amplitude = noise_amplitude(snr_vals).astype(np.float32)[:, np.newaxis, np.newaxis]
+    return faded + amplitude*noise
@@ -0,0 +1,381 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 
+# Copyright 2018 University of Arizona.
+# 
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+# 
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+
+from gnuradio import digital
+from constellations import *
+import numpy as np
+
+
+'''
+Vectorized counterparts of the transmitters in data_source. Each class
+produces a whole (batch_size, num_samples) complex64 array per call to
+generate(), with every row starting at a random point of its own waveform,
+so no flowgraph is involved.
+'''
+def rrc_taps(gain, sampling_freq, symbol_rate, alpha, ntaps):
+    '''
+    Same design as firdes.root_raised_cosine
+    '''
+    ntaps |= 1
+    spb = sampling_freq/float(symbol_rate)
+    xindx = np.arange(ntaps) - ntaps//2
+    x1 = np.pi*xindx/spb
+    x2 = 4*alpha*xindx/spb
+    x3 = x2*x2 - 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        num = np.where(
+            xindx != 0,
+            np.cos((1 + alpha)*x1) + np.sin((1 - alpha)*x1)/(4*alpha*xindx/spb),
+            np.cos((1 + alpha)*x1) + (1 - alpha)*np.pi/(4*alpha)
+        )
+        den = x3*np.pi
+        # Taps where x3 vanishes use the limit instead
+        num_lim = \
+            np.sin((1 + alpha)*x1)*(1 + alpha)*np.pi \
+            - np.cos((1 - alpha)*x1)*((1 - alpha)*np.pi*spb)/(4*alpha*xindx) \
+            + np.sin((1 - alpha)*x1)*spb*spb/(4*alpha*xindx*xindx)
+        den_lim = -32*np.pi*alpha*alpha*xindx/spb
+        singular = np.abs(x3) < 0.000001
+        taps = 4*alpha*np.where(singular, num_lim/den_lim, num/den)
+    scale = np.sum(taps)
+    if alpha == 1:
+        taps[singular] = -1
+        scale -= np.sum(taps[singular])
+    return taps*gain/scale
+
+
+def gaussian_taps(gain, spb, bt, ntaps):
+    '''
+    Same design as firdes.gaussian
+    '''
+    s = 1.0/(np.sqrt(np.log(2.0))/(2*np.pi*bt))
+    ts = s*(np.arange(1, ntaps + 1) - 0.5*ntaps)/spb
+    taps = np.exp(-0.5*ts*ts)
+    return taps*gain/np.sum(taps)
+
+
+def fir(x, taps):
+    '''
+    Causal FIR along the last axis of x, truncated to the input length like
+    a GNU Radio filter with declare_sample_delay(0)
+    '''
+    out = np.zeros(x.shape, dtype=np.result_type(x, np.float32))
+    for k, tap in enumerate(taps[:x.shape[-1]]):
+        out[..., k:] += tap*x[..., :x.shape[-1] - k]
+    return out
+
+
+def interpolate(x, taps, interp):
+    '''
+    Upsamples x by interp along the last axis through a polyphase bank made
+    from taps, one branch per output phase
+    '''
+    out = np.empty(x.shape[:-1] + (x.shape[-1]*interp,), dtype=np.result_type(x, np.float32))
+    for phase in range(interp):
+        out[..., phase::interp] = fir(x, taps[phase::interp])
+    return out
+
+
+def random_windows(x, num_samples, max_offset, rng):
+    '''
+    Row-wise window of num_samples starting at a random offset below
+    max_offset, so exemplars do not all start on a symbol boundary
+    '''
+    offsets = rng.randint(0, max_offset, size=(x.shape[0], 1))
+    return x[np.arange(x.shape[0])[:, np.newaxis], offsets + np.arange(num_samples)]
+
+
+class constellation_batch(object):
+    '''
+    Batch engine for constellation_source: uniform symbols mapped through
+    points and shaped by the same RRC filter as its pfb_arb_resampler_ccf
+    '''
+    def __init__(self, points, samp_per_sym=2, excess_bw=.35):
+        self.points = np.asarray(points, dtype=np.complex64)
+        self.samp_per_sym = int(samp_per_sym)
+        num_filters = 32
+        num_taps = num_filters * 11 * self.samp_per_sym  # make nfilts filters of ntaps each
+        prototype = rrc_taps(
+            num_filters,  # gain
+            num_filters,  # sampling rate based on 32 filters in resampler
+            1.0,  # symbol rate
+            excess_bw,  # excess bandwidth (roll-off factor)
+            num_taps)
+        # With an integer rate the arbitrary resampler only visits every
+        # num_filters/samp_per_sym-th arm of its bank
+        self.taps = prototype[::num_filters//self.samp_per_sym].astype(np.float32)
+        self.warmup = -(-len(self.taps)//self.samp_per_sym)
+
+    def generate(self, batch_size, num_samples, rng=None):
+        rng = np.random if rng is None else rng
+        num_symbols = self.warmup + -(-num_samples//self.samp_per_sym) + 1
+        symbols = self.points[rng.randint(0, len(self.points), size=(batch_size, num_symbols))]
+        shaped = interpolate(symbols, self.taps, self.samp_per_sym)[:, self.warmup*self.samp_per_sym:]
+        return random_windows(shaped, num_samples, self.samp_per_sym, rng)
+
+
+class gfsk_batch(object):
+    '''
+    Batch engine for tx_2gfsk/tx_4gfsk/tx_8gfsk: the symbol levels are
+    interpolated through the Gaussian frequency pulse of those classes and
+    the phase is integrated with a cumulative sum, like
+    frequency_modulator_fc, from a random starting phase per row.
+    '''
+    def __init__(self, bits_per_symbol, samp_per_sym=8, bt=.35, sensitivity=1.0):
+        self.levels = np.linspace(-2, 2, 2**bits_per_symbol).astype(np.float32)
+        self.samp_per_sym = samp_per_sym
+        self.sensitivity = sensitivity
+        # This design mirrors the internals of the GMSK mod block
+        self.taps = np.convolve(gaussian_taps(1, samp_per_sym, bt, 4*samp_per_sym), (1,)*samp_per_sym).astype(np.float32)
+        self.warmup = -(-len(self.taps)//samp_per_sym)
+
+    def generate(self, batch_size, num_samples, rng=None):
+        rng = np.random if rng is None else rng
+        num_symbols = self.warmup + -(-num_samples//self.samp_per_sym) + 1
+        symbols = self.levels[rng.randint(0, len(self.levels), size=(batch_size, num_symbols))]
+        freq = interpolate(symbols, self.taps, self.samp_per_sym)[:, self.warmup*self.samp_per_sym:]
+        freq = random_windows(freq, num_samples, self.samp_per_sym, rng)
+        phase = rng.uniform(-np.pi, np.pi, size=(batch_size, 1)) + np.cumsum(self.sensitivity*freq, axis=1, dtype=np.float64)
+        return np.exp(1j*phase).astype(np.complex64)
+
+
+def cpfsk_reference(symbols, k, ampl, samples_per_sym, bits_per_symbol, phase=0.0):
+    '''
+    NumPy model of classify.cpfsk_bc. symbols holds unpacked symbol values
+    along its last axis; the output has samples_per_sym samples per symbol
+    and starts from phase, like a fresh block with d_phase = phase.
+    '''
+    freq = k*np.pi/(samples_per_sym*bits_per_symbol)
+    mid = 2**(bits_per_symbol - 1)
+    symbols = np.asarray(symbols, dtype=np.int64)
+    # Levels sit symmetrically around mid and skip zero: ..., -1, 1, ...
+    steps = np.where(symbols >= mid, symbols - mid + 1, symbols - mid)*freq
+    phase = phase + np.cumsum(np.repeat(steps, samples_per_sym, axis=-1), axis=-1)
+    return (ampl*np.exp(1j*phase)).astype(np.complex64)
+
+
+class cpfsk_batch(object):
+    '''
+    Batch engine for tx_2cpfsk/tx_4cpfsk/tx_8cpfsk built on cpfsk_reference,
+    with a random starting phase and sample offset per row
+    '''
+    def __init__(self, bits_per_symbol, k=4.0, ampl=1.0, samp_per_sym=8):
+        self.bits_per_symbol = bits_per_symbol
+        self.k = k
+        self.ampl = ampl
+        self.samp_per_sym = samp_per_sym
+
+    def generate(self, batch_size, num_samples, rng=None):
+        rng = np.random if rng is None else rng
+        num_symbols = -(-num_samples//self.samp_per_sym) + 1
+        symbols = rng.randint(0, 2**self.bits_per_symbol, size=(batch_size, num_symbols))
+        out = cpfsk_reference(
+            symbols, self.k, self.ampl, self.samp_per_sym, self.bits_per_symbol,
+            rng.uniform(-np.pi, np.pi, size=(batch_size, 1))
+        )
+        return random_windows(out, num_samples, self.samp_per_sym, rng)
+
+
+class ofdm_batch(object):
+    '''
+    Batch engine for ofdm_source. A (batch, n_ofdm_symbols, fft_len) grid
+    gets data on the middle fft_len/2 carriers and fft_len/4 nulls on each
+    side, goes through one shifted, unnormalized inverse FFT like fft_vcc,
+    and is then given the cyclic prefix and raised cosine flanks of
+    ofdm_cyclic_prefixer before the same output scaling.
+    '''
+    def __init__(self, points, fft_len=32, rolloff=2):
+        self.points = np.asarray(points, dtype=np.complex64)
+        self.fft_len = fft_len
+        self.cp_len = fft_len//4
+        flank = np.arange(1, rolloff)
+        self.up_flank = 0.5*(1 + np.cos(np.pi*flank/rolloff - np.pi))
+        self.down_flank = 0.5*(1 + np.cos(np.pi*(rolloff - flank)/rolloff - np.pi))
+
+    def modulate(self, data):
+        '''
+        OFDM stream of data, shaped (..., num_ofdm_symbols, fft_len/2), as
+        ofdm_source emits it from a fresh start: the first symbol has no
+        predecessor to overlap its flank with.
+        '''
+        grid = np.zeros(data.shape[:-1] + (self.fft_len,), dtype=np.complex64)
+        grid[..., self.fft_len//4:3*self.fft_len//4] = data
+        body = self.fft_len*np.fft.ifft(np.fft.ifftshift(grid, axes=-1), axis=-1)
+
+        out = np.concatenate((body[..., -self.cp_len:], body), axis=-1)
+        num_flank = len(self.up_flank)
+        if num_flank:
+            out[..., :num_flank] *= self.up_flank
+            out[..., 1:, :num_flank] += body[..., :-1, :num_flank]*self.down_flank
+        return out.reshape(out.shape[:-2] + (-1,))/np.sqrt(self.fft_len/2.0)
+
+    def generate(self, batch_size, num_samples, rng=None):
+        rng = np.random if rng is None else rng
+        sym_len = self.fft_len + self.cp_len
+        # One extra symbol to take the first rolloff from and one for the offset
+        num_ofdm_symbols = -(-num_samples//sym_len) + 2
+        data = self.points[rng.randint(0, len(self.points), size=(batch_size, num_ofdm_symbols, self.fft_len//2))]
+        out = self.modulate(data)[:, sym_len:]
+        return random_windows(out, num_samples, sym_len, rng).astype(np.complex64)
+
+
+def lowpass_noise(batch_size, num_samples, cutoff, rng, response=None):
+    '''
+    Unit variance Gaussian noise band-limited to cutoff cycles/sample by
+    zeroing FFT bins, optionally shaped further by response(f)
+    '''
+    spectrum = np.fft.rfft(rng.standard_normal((batch_size, num_samples)), axis=-1)
+    freqs = np.fft.rfftfreq(num_samples)
+    gain = (freqs <= cutoff)/np.sqrt(2.0*cutoff)
+    if response is not None:
+        gain = gain*response(freqs)
+    return np.fft.irfft(spectrum*gain, num_samples, axis=-1)
+
+
+class am_dsb_batch(object):
+    '''
+    Batch engine for tx_am_dsb: 1 + m with m the noise message after its
+    fractional_resampler_ff, i.e. white up to half the resampling ratio
+    '''
+    def __init__(self, audio_rate=44.1e3, samp_rate=200e3):
+        self.cutoff = 0.5*audio_rate*2/samp_rate
+
+    def generate(self, batch_size, num_samples, rng=None):
+        rng = np.random if rng is None else rng
+        return (1.0 + lowpass_noise(batch_size, num_samples, self.cutoff, rng)).astype(np.complex64)
+
+
+class am_ssb_batch(object):
+    '''
+    Batch engine for tx_am_ssb: the analytic signal of 1 + m, which is what
+    hilbert_fc produces, computed with one FFT
+    '''
+    def __init__(self, audio_rate=44.1e3, samp_rate=200e3):
+        self.cutoff = 0.5*audio_rate/samp_rate
+
+    def generate(self, batch_size, num_samples, rng=None):
+        rng = np.random if rng is None else rng
+        message = 1.0 + lowpass_noise(batch_size, num_samples, self.cutoff, rng)
+        analytic = np.zeros(num_samples)
+        analytic[0] = 1
+        analytic[1:(num_samples + 1)//2] = 2
+        if num_samples % 2 == 0:
+            analytic[num_samples//2] = 1
+        return np.fft.ifft(np.fft.fft(message, axis=-1)*analytic, axis=-1).astype(np.complex64)
+
+
+class wbfm_batch(object):
+    '''
+    Batch engine for tx_wbfm. The message is the resampled noise as seen at
+    the wfm_tx quadrature rate, with its 75us pre-emphasis applied in the
+    frequency domain, and is integrated with a cumulative sum at the
+    wfm_tx sensitivity.
+    '''
+    def __init__(self, audio_rate=44.1e3, tau=75e-6):
+        quad_rate = 10*audio_rate
+        # fractional_resampler_ff(0.0, .5) halves the audio bandwidth
+        self.cutoff = 0.25*audio_rate/quad_rate
+        self.f_low = 1.0/(2*np.pi*tau)/quad_rate
+        self.f_high = 0.925*0.5
+        self.sensitivity = 2*np.pi*(audio_rate/2)/quad_rate
+
+    def preemphasis(self, freqs):
+        return np.abs((1 + 1j*freqs/self.f_low)/(1 + 1j*freqs/self.f_high))
+
+    def generate(self, batch_size, num_samples, rng=None):
+        rng = np.random if rng is None else rng
+        message = lowpass_noise(batch_size, num_samples, self.cutoff, rng, self.preemphasis)
+        phase = rng.uniform(-np.pi, np.pi, size=(batch_size, 1)) + np.cumsum(self.sensitivity*message, axis=-1)
+        return np.exp(1j*phase).astype(np.complex64)
+
+
+class lfm_batch(object):
+    '''
+    Batch engine for the radar transmitters. One period of the
+    frequency_modulator_fc output for the repeating table is precomputed,
+    so a batch is a table lookup from a random offset per row.
+    '''
+    def __init__(self, table, sensitivity=np.pi):
+        phase = np.cumsum(sensitivity*np.asarray(table, dtype=np.float64))
+        self.chirp = np.exp(1j*phase)
+        # Rotation accumulated over one full period
+        self.turn = np.exp(1j*phase[-1])
+
+    def generate(self, batch_size, num_samples, rng=None):
+        rng = np.random if rng is None else rng
+        period = len(self.chirp)
+        idx = rng.randint(0, period, size=(batch_size, 1)) + np.arange(num_samples)
+        out = self.chirp[idx % period]*self.turn**(idx//period - idx[:, :1]//period)
+        out *= np.exp(1j*rng.uniform(-np.pi, np.pi, size=(batch_size, 1)))
+        return out.astype(np.complex64)
+
+
+# Constellation of each key, as used by the matching tx_* class
+_constellations = {
+    'ook': constellation_ook,
+    'bpsk': lambda: digital.constellation_bpsk().base(),
+    '4ask': constellation_4_ask,
+    '4pam': constellation_4_pam,
+    '8pam': constellation_8_pam,
+    '8psk': lambda: digital.constellation_8psk().base(),
+    '8qam_circular': constellation_8qam_cross,  # tx_8qam_circular maps through the cross table
+    '8qam_cross': constellation_8qam_cross,
+    '16qam': lambda: digital.constellation_16qam().base(),
+    '16psk': constellation_16_psk,
+    '32qam_cross': constellation_32qam_cross,
+    '32qam_rect': constellation_32qam_rect,
+    '64qam': constellation_64qam
+}
+
+
+# FFT length and constellation of each OFDM key
+_ofdm = {
+    'ofdm-16-bpsk': (32, lambda: digital.constellation_bpsk().base()),
+    'ofdm-32-bpsk': (64, lambda: digital.constellation_bpsk().base()),
+    'ofdm-64-bpsk': (128, lambda: digital.constellation_bpsk().base()),
+    'ofdm-16-qpsk': (32, lambda: digital.constellation_qpsk().base()),
+    'ofdm-32-qpsk': (64, lambda: digital.constellation_qpsk().base()),
+    'ofdm-64-qpsk': (128, lambda: digital.constellation_qpsk().base())
+}
+
+
+def get_batch_source(tx_key):
+    if tx_key in _constellations:
+        return constellation_batch(_constellations[tx_key]().points())
+    elif tx_key in ('2gfsk', '4gfsk', '8gfsk'):
+        return gfsk_batch({'2gfsk': 1, '4gfsk': 2, '8gfsk': 3}[tx_key])
+    elif tx_key in ('2cpfsk', '4cpfsk', '8cpfsk'):
+        return cpfsk_batch({'2cpfsk': 1, '4cpfsk': 2, '8cpfsk': 3}[tx_key])
+    elif tx_key in _ofdm:
+        fft_len, constellation = _ofdm[tx_key]
+        return ofdm_batch(constellation().points(), fft_len)
+    elif tx_key == 'am-dsb':
+        return am_dsb_batch()
+    elif tx_key == 'am-ssb':
+        return am_ssb_batch()
+    elif tx_key == 'wbfm':
+        return wbfm_batch()
+    elif tx_key == 'lfm_triangle':
+        # Same tables as tx_lfm_triangle and tx_lfm_sawtooth
+        return lfm_batch(np.linspace(-.5, .5, 64))
+    elif tx_key == 'lfm_sawtooth':
+        return lfm_batch(np.concatenate((np.linspace(-.5, .5, 32), np.linspace(.5, -.5, 32))))
+    raise KeyError("No batch engine for %s" % tx_key)
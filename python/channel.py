@@ -24,7 +24,12 @@ import numpy as np
 
 
 class channel(gr.hier_block2):
-    def __init__(self, snr_db=0):
+    '''
+    noise_seed seeds the noise source and the subclasses pass fading_seed to
+    their fading model, so each channel instance can get its own realization.
+    Both default to the fixed seed 0 used so far.
+    '''
+    def __init__(self, snr_db=0, noise_seed=0):
         gr.hier_block2.__init__(
             self, "channel",
             gr.io_signature(1, 1, gr.sizeof_gr_complex),
@@ -37,7 +42,7 @@ class channel(gr.hier_block2):
             analog.noise_source_c(
                 analog.GR_GAUSSIAN,
                 np.sqrt(10.0 ** (-self.snr_db / 10.0)),  # Noise amp
-                0
+                noise_seed
             )
         self.connect(self.add, self)
         self.connect(self.noise, (self.add, 1))
@@ -53,35 +58,35 @@ class chan_none(channel):
 
 
 class chan_awgn(channel):
-    def __init__(self, snr_db=0):
-        channel.__init__(self, snr_db=snr_db)
+    def __init__(self, snr_db=0, noise_seed=0, fading_seed=0):
+        channel.__init__(self, snr_db=snr_db, noise_seed=noise_seed)
         self.connect(self, self.add)
 
 
 class chan_flat_fading(channel):
-    def __init__(self, snr_db=0):
-        channel.__init__(self, snr_db=snr_db)
+    def __init__(self, snr_db=0, noise_seed=0, fading_seed=0):
+        channel.__init__(self, snr_db=snr_db, noise_seed=noise_seed)
         self.chan = \
             channels.fading_model(
                 8,                          # n_max_sinusoids
                 1.0/200e3,                  # max Doppler
                 False,                      # LOS(True)/NLOS(False)
                 4.0,                        # K-value in Rician
-                0                           # seed
+                fading_seed                 # seed
             )
         self.connect(self, self.chan, self.add)
 
 
 class chan_selective_fading(channel):
-    def __init__(self, snr_db=0):
-        channel.__init__(self, snr_db=snr_db)
+    def __init__(self, snr_db=0, noise_seed=0, fading_seed=0):
+        channel.__init__(self, snr_db=snr_db, noise_seed=noise_seed)
         self.chan = \
             channels.selective_fading_model(
                 8,                          # n sinusoids
                 1.0/200e3,                  # max Doppler
                 False,                      # LOS(True)/NLOS(False)
                 4.0,                        # K-value in Rician fading
-                0,                          # seed
+                fading_seed,                # seed
                 (0.0, 0.9, 1.7),            # PDP delays
                 (1, 0.8, 0.3),              # PDP Magnitudes
                 8                           # ntaps in channel impulse response
@@ -93,8 +98,8 @@ class chan_radio_awgn(channel):
     '''
     Haven't tested
     '''
-    def __init__(self, snr_db=0):
-        channel.__init__(self, snr_db=snr_db)
+    def __init__(self, snr_db=0, noise_seed=0, fading_seed=0):
+        channel.__init__(self, snr_db=snr_db, noise_seed=noise_seed)
         self.chan = \
             channels.dynamic_channel_model(
                 200e3,      # sample_rate
@@ -110,14 +115,14 @@ class chan_radio_awgn(channel):
                 (1,),       # PDP Magnitudes
                 1,                  # ntaps in channel impulse response
                 0,                  # Noise amp (is added later)
-                0                   # seed
+                fading_seed         # seed
             )
         self.connect(self, self.chan, self.add)
 
 
 class chan_radio_flat_fading(channel):
-    def __init__(self, snr_db=0):
-        channel.__init__(self, snr_db=snr_db)
+    def __init__(self, snr_db=0, noise_seed=0, fading_seed=0):
+        channel.__init__(self, snr_db=snr_db, noise_seed=noise_seed)
         self.chan = \
             channels.dynamic_channel_model(
                 200e3,      # sample_rate
@@ -133,14 +138,14 @@ class chan_radio_flat_fading(channel):
                 (1,),       # PDP Magnitudes
                 1,                  # ntaps in channel impulse response
                 0,                  # Noise amp (is added later)
-                0                   # seed
+                fading_seed         # seed
             )
         self.connect(self, self.chan, self.add)
 
 
 class chan_radio_selective_fading(channel):
-    def __init__(self, snr_db=0):
-        channel.__init__(self, snr_db=snr_db)
+    def __init__(self, snr_db=0, noise_seed=0, fading_seed=0):
+        channel.__init__(self, snr_db=snr_db, noise_seed=noise_seed)
         self.chan = \
             channels.dynamic_channel_model(
                 200e3,      # sample_rate
@@ -156,6 +161,6 @@ class chan_radio_selective_fading(channel):
                 (1, 0.8, 0.3),      # PDP Magnitudes
                 8,                  # ntaps in channel impulse response
                 0,                  # Noise amp (is added later)
-                0                   # seed
+                fading_seed         # seed
             )
         self.connect(self, self.chan, self.add)
@@ -26,20 +26,26 @@ import classify
 import numpy as np
 
 
+def random_seed(seed=None):
+    '''
+    Seed for a random_source_b; drawn from numpy's global state when None
+    '''
+    if seed is None:
+        seed = np.random.randint(0, 2**31)
+    return int(seed)
+
+
 '''
 All constellation based transmitters
 '''
 class constellation_source(gr.hier_block2):
-    def __init__(self, mod_name="", samp_per_sym=2, excess_bw=.35):
+    def __init__(self, mod_name="", samp_per_sym=2, excess_bw=.35, seed=None):
         gr.hier_block2.__init__(
             self, mod_name,
             gr.io_signature(0, 0, 0),
             gr.io_signature(1, 1, gr.sizeof_gr_complex)
         )
-        self.random_source = \
-            blocks.vector_source_b(
-                map(int, np.random.randint(0, 255, int(1e6))), True
-            )
+        self.random_source = classify.random_source_b(random_seed(seed))
         num_filters = 32
         num_taps = num_filters * 11 * int(samp_per_sym)  # make nfilts filters of ntaps each
         rrc_taps = filter.firdes.root_raised_cosine(
@@ -54,8 +60,8 @@ class constellation_source(gr.hier_block2):
 
 
 class tx_ook(constellation_source):
-    def __init__(self):
-        constellation_source.__init__(self, mod_name="ook", samp_per_sym=2, excess_bw=.35)
+    def __init__(self, seed=None):
+        constellation_source.__init__(self, mod_name="ook", samp_per_sym=2, excess_bw=.35, seed=seed)
         self.const = constellation_ook()
         self.pack = blocks.packed_to_unpacked_bb(self.const.bits_per_symbol(), gr.GR_MSB_FIRST)
         self.map = digital.chunks_to_symbols_bc((self.const.points()), 1)
@@ -63,8 +69,8 @@ class tx_ook(constellation_source):
 
 
 class tx_bpsk(constellation_source):
-    def __init__(self):
-        constellation_source.__init__(self, mod_name="bpsk", samp_per_sym=2, excess_bw=.35)
+    def __init__(self, seed=None):
+        constellation_source.__init__(self, mod_name="bpsk", samp_per_sym=2, excess_bw=.35, seed=seed)
         self.const = digital.constellation_bpsk().base()
         self.pack = blocks.packed_to_unpacked_bb(self.const.bits_per_symbol(), gr.GR_MSB_FIRST)
         self.map = digital.chunks_to_symbols_bc((self.const.points()), 1)
@@ -72,8 +78,8 @@ class tx_bpsk(constellation_source):
 
 
 class tx_4pam(constellation_source):
-    def __init__(self):
-        constellation_source.__init__(self, mod_name="4pam", samp_per_sym=2, excess_bw=.35)
+    def __init__(self, seed=None):
+        constellation_source.__init__(self, mod_name="4pam", samp_per_sym=2, excess_bw=.35, seed=seed)
         self.const = constellation_4_pam()
         self.pack = blocks.packed_to_unpacked_bb(self.const.bits_per_symbol(), gr.GR_MSB_FIRST)
         self.map = digital.chunks_to_symbols_bc((self.const.points()), 1)
@@ -81,8 +87,8 @@ class tx_4pam(constellation_source):
 
 
 class tx_4ask(constellation_source):
-    def __init__(self):
-        constellation_source.__init__(self, mod_name="4ask", samp_per_sym=2, excess_bw=.35)
+    def __init__(self, seed=None):
+        constellation_source.__init__(self, mod_name="4ask", samp_per_sym=2, excess_bw=.35, seed=seed)
         self.const = constellation_4_ask()
         self.pack = blocks.packed_to_unpacked_bb(self.const.bits_per_symbol(), gr.GR_MSB_FIRST)
         self.map = digital.chunks_to_symbols_bc((self.const.points()), 1)
@@ -90,8 +96,8 @@ class tx_4ask(constellation_source):
 
 
 class tx_8pam(constellation_source):
-    def __init__(self):
-        constellation_source.__init__(self, mod_name="8pam", samp_per_sym=2, excess_bw=.35)
+    def __init__(self, seed=None):
+        constellation_source.__init__(self, mod_name="8pam", samp_per_sym=2, excess_bw=.35, seed=seed)
         self.const = constellation_8_pam()
         self.pack = blocks.packed_to_unpacked_bb(self.const.bits_per_symbol(), gr.GR_MSB_FIRST)
         self.map = digital.chunks_to_symbols_bc((self.const.points()), 1)
@@ -99,8 +105,8 @@ class tx_8pam(constellation_source):
 
 
 class tx_8psk(constellation_source):
-    def __init__(self):
-        constellation_source.__init__(self, mod_name="8psk", samp_per_sym=2, excess_bw=.35)
+    def __init__(self, seed=None):
+        constellation_source.__init__(self, mod_name="8psk", samp_per_sym=2, excess_bw=.35, seed=seed)
         self.const = digital.constellation_8psk().base()
         self.pack = blocks.packed_to_unpacked_bb(self.const.bits_per_symbol(), gr.GR_MSB_FIRST)
         self.map = digital.chunks_to_symbols_bc((self.const.points()), 1)
@@ -108,8 +114,8 @@ class tx_8psk(constellation_source):
 
 
 class tx_8qam_circular(constellation_source):
-    def __init__(self):
-        constellation_source.__init__(self, mod_name="8qam_circular", samp_per_sym=2, excess_bw=.35)
+    def __init__(self, seed=None):
+        constellation_source.__init__(self, mod_name="8qam_circular", samp_per_sym=2, excess_bw=.35, seed=seed)
         self.const = constellation_8qam_cross()
         self.pack = blocks.packed_to_unpacked_bb(self.const.bits_per_symbol(), gr.GR_MSB_FIRST)
         self.map = digital.chunks_to_symbols_bc((self.const.points()), 1)
@@ -117,8 +123,8 @@ class tx_8qam_circular(constellation_source):
 
 
 class tx_8qam_cross(constellation_source):
-    def __init__(self):
-        constellation_source.__init__(self, mod_name="8qam_cross", samp_per_sym=2, excess_bw=.35)
+    def __init__(self, seed=None):
+        constellation_source.__init__(self, mod_name="8qam_cross", samp_per_sym=2, excess_bw=.35, seed=seed)
         self.const = constellation_8qam_cross()
         self.pack = blocks.packed_to_unpacked_bb(self.const.bits_per_symbol(), gr.GR_MSB_FIRST)
         self.map = digital.chunks_to_symbols_bc((self.const.points()), 1)
@@ -126,8 +132,8 @@ class tx_8qam_cross(constellation_source):
 
 
 class tx_16qam(constellation_source):
-    def __init__(self):
-        constellation_source.__init__(self, mod_name="16pam", samp_per_sym=2, excess_bw=.35)
+    def __init__(self, seed=None):
+        constellation_source.__init__(self, mod_name="16pam", samp_per_sym=2, excess_bw=.35, seed=seed)
         self.const = digital.constellation_16qam().base()
         self.pack = blocks.packed_to_unpacked_bb(self.const.bits_per_symbol(), gr.GR_MSB_FIRST)
         self.map = digital.chunks_to_symbols_bc((self.const.points()), 1)
@@ -135,8 +141,8 @@ class tx_16qam(constellation_source):
 
 
 class tx_16psk(constellation_source):
-    def __init__(self):
-        constellation_source.__init__(self, mod_name="16psk", samp_per_sym=2, excess_bw=.35)
+    def __init__(self, seed=None):
+        constellation_source.__init__(self, mod_name="16psk", samp_per_sym=2, excess_bw=.35, seed=seed)
         self.const = constellation_16_psk()
         self.pack = blocks.packed_to_unpacked_bb(self.const.bits_per_symbol(), gr.GR_MSB_FIRST)
         self.map = digital.chunks_to_symbols_bc((self.const.points()), 1)
@@ -144,8 +150,8 @@ class tx_16psk(constellation_source):
 
 
 class tx_32qam_cross(constellation_source):
-    def __init__(self):
-        constellation_source.__init__(self, mod_name="32qam_cross", samp_per_sym=2, excess_bw=.35)
+    def __init__(self, seed=None):
+        constellation_source.__init__(self, mod_name="32qam_cross", samp_per_sym=2, excess_bw=.35, seed=seed)
         self.const = constellation_32qam_cross()
         self.pack = blocks.packed_to_unpacked_bb(self.const.bits_per_symbol(), gr.GR_MSB_FIRST)
         self.map = digital.chunks_to_symbols_bc((self.const.points()), 1)
@@ -153,8 +159,8 @@ class tx_32qam_cross(constellation_source):
 
 
 class tx_32qam_rect(constellation_source):
-    def __init__(self):
-        constellation_source.__init__(self, mod_name="32qam_rect", samp_per_sym=2, excess_bw=.35)
+    def __init__(self, seed=None):
+        constellation_source.__init__(self, mod_name="32qam_rect", samp_per_sym=2, excess_bw=.35, seed=seed)
         self.const = constellation_32qam_rect()
         self.pack = blocks.packed_to_unpacked_bb(self.const.bits_per_symbol(), gr.GR_MSB_FIRST)
         self.map = digital.chunks_to_symbols_bc((self.const.points()), 1)
@@ -162,8 +168,8 @@ class tx_32qam_rect(constellation_source):
 
 
 class tx_64qam(constellation_source):
-    def __init__(self):
-        constellation_source.__init__(self, mod_name="64qam", samp_per_sym=2, excess_bw=.35)
+    def __init__(self, seed=None):
+        constellation_source.__init__(self, mod_name="64qam", samp_per_sym=2, excess_bw=.35, seed=seed)
         self.const = constellation_64qam()
         self.pack = blocks.packed_to_unpacked_bb(self.const.bits_per_symbol(), gr.GR_MSB_FIRST)
         self.map = digital.chunks_to_symbols_bc((self.const.points()), 1)
@@ -174,22 +180,19 @@ class tx_64qam(constellation_source):
 All FSK Transmitters
 '''
 class fsk_source(gr.hier_block2):
-    def __init__(self, mod_name="", samp_per_sym=8):
+    def __init__(self, mod_name="", samp_per_sym=8, seed=None):
         gr.hier_block2.__init__(
             self, mod_name,
             gr.io_signature(0, 0, 0),
             gr.io_signature(1, 1, gr.sizeof_gr_complex)
         )
         self.samp_per_sym = samp_per_sym
-        self.random_source = \
-            blocks.vector_source_b(
-                map(int, np.random.randint(0, 256, int(1e6))), True
-            )
+        self.random_source = classify.random_source_b(random_seed(seed))
 
 
 class tx_2gfsk(fsk_source):
-    def __init__(self):
-        fsk_source.__init__(self, mod_name="2gfsk", samp_per_sym=8)
+    def __init__(self, seed=None):
+        fsk_source.__init__(self, mod_name="2gfsk", samp_per_sym=8, seed=seed)
         self.pack = blocks.packed_to_unpacked_bb(1, gr.GR_MSB_FIRST)
         self.map = digital.chunks_to_symbols_bf(np.linspace(-2, 2, 2), 1)
         # This design mirrors the internals of the GMSK mod block
@@ -205,8 +208,8 @@ class tx_2gfsk(fsk_source):
 
 
 class tx_4gfsk(fsk_source):
-    def __init__(self):
-        fsk_source.__init__(self, mod_name="4gfsk", samp_per_sym=8)
+    def __init__(self, seed=None):
+        fsk_source.__init__(self, mod_name="4gfsk", samp_per_sym=8, seed=seed)
         self.pack = blocks.packed_to_unpacked_bb(2, gr.GR_MSB_FIRST)
         self.map = digital.chunks_to_symbols_bf(np.linspace(-2, 2, 4), 1)
         # This design mirrors the internals of the GMSK mod block
@@ -221,8 +224,8 @@ class tx_4gfsk(fsk_source):
         self.connect(self.random_source, self.pack, self.map, self.filt, self.mod, self)
 
 class tx_8gfsk(fsk_source):
-    def __init__(self):
-        fsk_source.__init__(self, mod_name="8gfsk", samp_per_sym=8)
+    def __init__(self, seed=None):
+        fsk_source.__init__(self, mod_name="8gfsk", samp_per_sym=8, seed=seed)
         self.pack = blocks.packed_to_unpacked_bb(3, gr.GR_MSB_FIRST)
         self.map = digital.chunks_to_symbols_bf(np.linspace(-2, 2, 8), 1)
         # This design mirrors the internals of the GMSK mod block
@@ -238,24 +241,24 @@ class tx_8gfsk(fsk_source):
 
 
 class tx_2cpfsk(fsk_source):
-    def __init__(self):
-        fsk_source.__init__(self, mod_name="2cpfsk", samp_per_sym=8)
+    def __init__(self, seed=None):
+        fsk_source.__init__(self, mod_name="2cpfsk", samp_per_sym=8, seed=seed)
         self.pack = blocks.packed_to_unpacked_bb(1, gr.GR_MSB_FIRST)
         self.mod = classify.cpfsk_bc(4.0, 1.0, self.samp_per_sym, 1)
         self.connect(self.random_source, self.pack, self.mod, self)
 
 
 class tx_4cpfsk(fsk_source):
-    def __init__(self):
-        fsk_source.__init__(self, mod_name="4cpfsk", samp_per_sym=8)
+    def __init__(self, seed=None):
+        fsk_source.__init__(self, mod_name="4cpfsk", samp_per_sym=8, seed=seed)
         self.pack = blocks.packed_to_unpacked_bb(2, gr.GR_MSB_FIRST)
         self.mod = classify.cpfsk_bc(4.0, 1.0, self.samp_per_sym, 2)
         self.connect(self.random_source, self.pack, self.mod, self)
 
 
 class tx_8cpfsk(fsk_source):
-    def __init__(self):
-        fsk_source.__init__(self, mod_name="8cpfsk", samp_per_sym=8)
+    def __init__(self, seed=None):
+        fsk_source.__init__(self, mod_name="8cpfsk", samp_per_sym=8, seed=seed)
         self.pack = blocks.packed_to_unpacked_bb(3, gr.GR_MSB_FIRST)
         self.mod = classify.cpfsk_bc(4.0, 1.0, self.samp_per_sym, 3)
         self.connect(self.random_source, self.pack, self.mod, self)
@@ -265,16 +268,13 @@ class tx_8cpfsk(fsk_source):
 All OFDM Transmitters
 '''
 class ofdm_source(gr.hier_block2):
-    def __init__(self, mod_name="", fft_len=32):
+    def __init__(self, mod_name="", fft_len=32, seed=None):
         gr.hier_block2.__init__(
             self, mod_name,
             gr.io_signature(0, 0, 0),
             gr.io_signature(1, 1, gr.sizeof_gr_complex)
         )
-        self.random_source = \
-            blocks.vector_source_b(
-                map(int, np.random.randint(0, 255, int(1e6))), True
-            )
+        self.random_source = classify.random_source_b(random_seed(seed))
         self.null = blocks.null_source(gr.sizeof_gr_complex*1)
         self.rolloff = 2
         self.fft_len = fft_len
@@ -287,8 +287,8 @@ class ofdm_source(gr.hier_block2):
 
 
 class tx_ofdm_16_bpsk(ofdm_source):
-    def __init__(self):
-        ofdm_source.__init__(self, mod_name="ofdm_16_bpsk", fft_len=32)
+    def __init__(self, seed=None):
+        ofdm_source.__init__(self, mod_name="ofdm_16_bpsk", fft_len=32, seed=seed)
         self.const = digital.constellation_bpsk().base()
         self.pack = blocks.packed_to_unpacked_bb(self.const.bits_per_symbol(), gr.GR_MSB_FIRST)
         self.map = digital.chunks_to_symbols_bc((self.const.points()), 1)
@@ -301,8 +301,8 @@ class tx_ofdm_16_bpsk(ofdm_source):
 
 
 class tx_ofdm_32_bpsk(ofdm_source):
-    def __init__(self):
-        ofdm_source.__init__(self, mod_name="ofdm_32_bpsk", fft_len=64)
+    def __init__(self, seed=None):
+        ofdm_source.__init__(self, mod_name="ofdm_32_bpsk", fft_len=64, seed=seed)
         self.const = digital.constellation_bpsk().base()
         self.pack = blocks.packed_to_unpacked_bb(self.const.bits_per_symbol(), gr.GR_MSB_FIRST)
         self.map = digital.chunks_to_symbols_bc((self.const.points()), 1)
@@ -315,8 +315,8 @@ class tx_ofdm_32_bpsk(ofdm_source):
 
 
 class tx_ofdm_64_bpsk(ofdm_source):
-    def __init__(self):
-        ofdm_source.__init__(self, mod_name="ofdm_64_bpsk", fft_len=128)
+    def __init__(self, seed=None):
+        ofdm_source.__init__(self, mod_name="ofdm_64_bpsk", fft_len=128, seed=seed)
         self.const = digital.constellation_bpsk().base()
         self.pack = blocks.packed_to_unpacked_bb(self.const.bits_per_symbol(), gr.GR_MSB_FIRST)
         self.map = digital.chunks_to_symbols_bc((self.const.points()), 1)
@@ -329,8 +329,8 @@ class tx_ofdm_64_bpsk(ofdm_source):
 
 
 class tx_ofdm_16_qpsk(ofdm_source):
-    def __init__(self):
-        ofdm_source.__init__(self, mod_name="ofdm_16_qpsk", fft_len=32)
+    def __init__(self, seed=None):
+        ofdm_source.__init__(self, mod_name="ofdm_16_qpsk", fft_len=32, seed=seed)
         self.const = digital.constellation_qpsk().base()
         self.pack = blocks.packed_to_unpacked_bb(self.const.bits_per_symbol(), gr.GR_MSB_FIRST)
         self.map = digital.chunks_to_symbols_bc((self.const.points()), 1)
@@ -343,8 +343,8 @@ class tx_ofdm_16_qpsk(ofdm_source):
 
 
 class tx_ofdm_32_qpsk(ofdm_source):
-    def __init__(self):
-        ofdm_source.__init__(self, mod_name="ofdm_32_qpsk", fft_len=64)
+    def __init__(self, seed=None):
+        ofdm_source.__init__(self, mod_name="ofdm_32_qpsk", fft_len=64, seed=seed)
         self.const = digital.constellation_qpsk().base()
         self.pack = blocks.packed_to_unpacked_bb(self.const.bits_per_symbol(), gr.GR_MSB_FIRST)
         self.map = digital.chunks_to_symbols_bc((self.const.points()), 1)
@@ -357,8 +357,8 @@ class tx_ofdm_32_qpsk(ofdm_source):
 
 
 class tx_ofdm_64_qpsk(ofdm_source):
-    def __init__(self):
-        ofdm_source.__init__(self, mod_name="ofdm_64_qpsk", fft_len=128)
+    def __init__(self, seed=None):
+        ofdm_source.__init__(self, mod_name="ofdm_64_qpsk", fft_len=128, seed=seed)
         self.const = digital.constellation_qpsk().base()
         self.pack = blocks.packed_to_unpacked_bb(self.const.bits_per_symbol(), gr.GR_MSB_FIRST)
         self.map = digital.chunks_to_symbols_bc((self.const.points()), 1)
@@ -374,28 +374,28 @@ class tx_ofdm_64_qpsk(ofdm_source):
 All analog data-bearing transmitters
 '''
 class analog_source(gr.hier_block2):
-    def __init__(self, mod_name="", audio_rate=44.1e3):
+    def __init__(self, mod_name="", audio_rate=44.1e3, seed=None):
         gr.hier_block2.__init__(
             self, mod_name,
             gr.io_signature(0, 0, 0),
             gr.io_signature(1, 1, gr.sizeof_gr_complex)
         )
         self.random_source = \
-            analog.noise_source_f(analog.GR_GAUSSIAN, 1, 0)
+            analog.noise_source_f(analog.GR_GAUSSIAN, 1, 0 if seed is None else seed)
         self.audio_rate = audio_rate
 
 
 class tx_wbfm(analog_source):
-    def __init__(self):
-        analog_source.__init__(self, mod_name="wbfm", audio_rate=44.1e3)
+    def __init__(self, seed=None):
+        analog_source.__init__(self, mod_name="wbfm", audio_rate=44.1e3, seed=seed)
         self.interp = filter.fractional_resampler_ff(0.0, .5)
         self.mod = analog.wfm_tx(audio_rate=self.audio_rate, quad_rate=10*self.audio_rate, max_dev=self.audio_rate/2)
         self.connect(self.random_source, self.interp, self.mod, self)
 
 
 class tx_am_dsb(analog_source):
-    def __init__(self):
-        analog_source.__init__(self, mod_name="am-dsb", audio_rate=44.1e3)
+    def __init__(self, seed=None):
+        analog_source.__init__(self, mod_name="am-dsb", audio_rate=44.1e3, seed=seed)
         self.interp = filter.fractional_resampler_ff(0.0, self.audio_rate*2/200e3)
         self.cnv = blocks.float_to_complex()
         self.add = blocks.add_const_cc(1.0)
@@ -404,8 +404,8 @@ class tx_am_dsb(analog_source):
 
 
 class tx_am_ssb(analog_source):
-    def __init__(self):
-        analog_source.__init__(self, mod_name="am-ssb", audio_rate=44.1e3)
+    def __init__(self, seed=None):
+        analog_source.__init__(self, mod_name="am-ssb", audio_rate=44.1e3, seed=seed)
         self.interp = filter.fractional_resampler_ff(0.0, self.audio_rate/200e3)
         self.add = blocks.add_const_ff(1.0)
         self.mod = blocks.multiply_ff()
@@ -417,7 +417,9 @@ class tx_am_ssb(analog_source):
 All radar transmitters
 '''
 class radar_source(gr.hier_block2):
-    def __init__(self, mod_name="", chirp_len=64):
+    def __init__(self, mod_name="", chirp_len=64, seed=None):
+        # The chirps are deterministic, seed only keeps the constructor
+        # signature the same as the other sources
         gr.hier_block2.__init__(
             self, mod_name,
             gr.io_signature(0, 0, 0),
@@ -428,8 +430,8 @@ class radar_source(gr.hier_block2):
 
 
 class tx_lfm_triangle(radar_source):
-    def __init__(self):
-        radar_source.__init__(self, mod_name="fmcw-triangle", chirp_len=64)
+    def __init__(self, seed=None):
+        radar_source.__init__(self, mod_name="fmcw-triangle", chirp_len=64, seed=seed)
         self.source = blocks.vector_source_f(
             np.linspace(-.5, .5, self.chirp_len),
             True
@@ -438,8 +440,8 @@ class tx_lfm_triangle(radar_source):
 
 
 class tx_lfm_sawtooth(radar_source):
-    def __init__(self):
-        radar_source.__init__(self, mod_name="fmcw-sawtooth", chirp_len=64)
+    def __init__(self, seed=None):
+        radar_source.__init__(self, mod_name="fmcw-sawtooth", chirp_len=64, seed=seed)
         self.source = blocks.vector_source_f(
             np.concatenate((
                 np.linspace(-.5, .5, self.chirp_len/2),
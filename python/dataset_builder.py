@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 
+# Copyright 2018 University of Arizona.
+# 
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+# 
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+
+from iq_dataset import iq_dataset, snr_array
+import numpy as np
+
+
+class dataset_builder(object):
+    '''
+    Preallocated storage for a whole SNR x transmitter sweep. Rows are laid
+    out SNR-major with num_exemplars_per_key rows per (snr, tx) pair, which
+    is the order generate_dataset has always produced. Jobs write float32
+    (I, Q) pairs into rows(), and to_dataset() hands the same memory out as
+    a complex64 iq_dataset.
+    '''
+    def __init__(self, tx_keys, snr_vals, num_exemplars_per_key, num_cplx_samples):
+        self.mod_names = list(tx_keys)
+        self.snr_vals = list(snr_vals)
+        self.num_exemplars_per_key = num_exemplars_per_key
+        self.num_cplx_samples = num_cplx_samples
+
+        num_tx = len(self.mod_names)
+        num_rows = len(self.snr_vals)*num_tx*num_exemplars_per_key
+        self.data = np.zeros((num_rows, num_cplx_samples, 2), dtype=np.float32)
+        # Labels and SNRs only depend on the row layout, so fill them now
+        label_dtype = np.int8 if num_tx <= np.iinfo(np.int8).max else np.int16
+        self.label = np.tile(
+            np.repeat(np.arange(num_tx, dtype=label_dtype), num_exemplars_per_key),
+            len(self.snr_vals)
+        )
+        self.snr_db = np.repeat(
+            snr_array(self.snr_vals),
+            num_tx*num_exemplars_per_key
+        )
+
+    def rows(self, idx_snr, idx_tx):
+        '''
+        Writable view of the exemplars belonging to one (snr, tx) pair
+        '''
+        start = (idx_snr*len(self.mod_names) + idx_tx)*self.num_exemplars_per_key
+        return self.data[start:start + self.num_exemplars_per_key]
+
+    def to_dataset(self):
+        '''
+        iq_dataset view of the sweep, without copying the samples
+        '''
+        return iq_dataset(self.data.view(np.complex64)[:, :, 0], self.label, self.mod_names, self.snr_db)
+
+    def to_dataframe(self):
+        '''
+        Legacy layout: num_cplx_samples*2 float columns followed by mod_name
+        and snr_db. The float columns share memory with self.data.
+        '''
+        return self.to_dataset().to_dataframe()
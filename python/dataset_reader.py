@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 
+# Copyright 2018 University of Arizona.
+# 
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+# 
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+import numpy as np
+import collections
+import json
+import os
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+
+def dequantize(iq, scale):
+    '''
+    float32 IQ from the quantized rows iq and their per-exemplar scale, or
+    iq itself when scale is None
+    '''
+    if scale is None:
+        return iq
+    return np.multiply(iq, scale[:, np.newaxis, np.newaxis], dtype=np.float32)
+
+
+class dataset_view(object):
+    '''
+    An ordered list of (shard, start, stop) row ranges over the shards of a
+    dataset_reader. Nothing is copied until rows are gathered with batch().
+    Every shard is (iq, label, snr, scale), where scale is None unless the
+    IQ is quantized; quantized IQ always comes out as float32.
+    '''
+    def __init__(self, shards, mod_names, segments, num_cplx_samples):
+        self.shards = shards
+        self.mod_names = mod_names
+        self.num_cplx_samples = num_cplx_samples
+        self.segments = segments
+        self._ends = np.cumsum([stop - start for idx_shard, start, stop in segments], dtype=np.int64)
+
+    def __len__(self):
+        return int(self._ends[-1]) if len(self._ends) else 0
+
+    def __getitem__(self, idx):
+        '''
+        Returns (iq, mod_name, snr_db) for row idx of the view
+        '''
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("row %d out of range" % idx)
+        idx_segment = np.searchsorted(self._ends, idx, side="right")
+        idx_shard, start, stop = self.segments[idx_segment]
+        row = start + idx - (self._ends[idx_segment] - (stop - start))
+        iq, label, snr, scale = self.shards[idx_shard]
+        if scale is not None:
+            return dequantize(iq[row:row + 1], scale[row:row + 1])[0], self.mod_names[label[row]], int(snr[row])
+        return iq[row], self.mod_names[label[row]], int(snr[row])
+
+    def iter_segments(self):
+        '''
+        Yields (iq, label, snr) per row range. For float32 npy shards these
+        are slices of the memory maps, so iterating copies no IQ.
+        '''
+        for idx_shard, start, stop in self.segments:
+            iq, label, snr, scale = self.shards[idx_shard]
+            yield (dequantize(iq[start:stop], None if scale is None else scale[start:stop]),
+                   label[start:stop], snr[start:stop])
+
+    def batch(self, indices):
+        '''
+        Gathers the rows at indices into new arrays (iq, label, snr), in the
+        order given. label holds codes into mod_names. Indices may repeat.
+        '''
+        indices = np.asarray(indices, dtype=np.int64)
+        iq_batch = np.empty((len(indices), self.num_cplx_samples or 0, 2), dtype=np.float32)
+        labels = np.empty(len(indices), dtype=np.int16)
+        snr = np.empty(len(indices), dtype=np.int8)
+        if not len(indices):
+            return iq_batch, labels, snr
+        segments = np.array(self.segments, dtype=np.int64)
+        idx_segments = np.searchsorted(self._ends, indices, side="right")
+        idx_shards, starts, stops = segments[idx_segments].T
+        rows = starts + indices - (self._ends[idx_segments] - (stops - starts))
+        for idx_shard in np.unique(idx_shards):
+            mask = idx_shards == idx_shard
+            shard_iq, shard_label, shard_snr, shard_scale = self.shards[idx_shard]
+            # h5py needs unique increasing indices, so read those and scatter back
+            shard_rows, inverse = np.unique(rows[mask], return_inverse=True)
+            iq_batch[mask] = dequantize(
+                shard_iq[shard_rows], None if shard_scale is None else shard_scale[shard_rows]
+            )[inverse]
+            labels[mask] = shard_label[shard_rows][inverse]
+            snr[mask] = shard_snr[shard_rows][inverse]
+        return iq_batch, labels, snr
+
+
+class dataset_reader(dataset_view):
+    '''
+    Opens a directory written by dataset_writer. npy shards are memory
+    mapped and HDF5 shards are read lazily through h5py; only the label and
+    snr columns are loaded, to build ranges, which maps every
+    (mod_name, snr_db) to the row ranges holding it. close(), or leaving a
+    with block, closes the HDF5 files.
+    '''
+    def __init__(self, path):
+        with open(os.path.join(path, "index.json")) as f:
+            index = json.load(f)
+        self.path = path
+        self.file_format = index["format"]
+        self.iq_dtype = index.get("iq_dtype", "float32")
+        self._files = []
+        shards = [self._open(shard) for shard in index["shards"]]
+        dataset_view.__init__(
+            self, shards, [str(name) for name in index["mod_names"]],
+            [(idx_shard, 0, len(shard[1])) for idx_shard, shard in enumerate(shards)],
+            index["num_cplx_samples"]
+        )
+
+        self.ranges = collections.OrderedDict()
+        for idx_shard, (iq, label, snr, scale) in enumerate(self.shards):
+            bounds = np.flatnonzero((label[1:] != label[:-1]) | (snr[1:] != snr[:-1])) + 1
+            starts = np.concatenate(([0], bounds))
+            stops = np.concatenate((bounds, [len(label)]))
+            for start, stop in zip(starts, stops):
+                key = (self.mod_names[label[start]], int(snr[start]))
+                self.ranges.setdefault(key, []).append((idx_shard, int(start), int(stop)))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        '''
+        Closes the HDF5 files of the shards. Views of this reader can not be
+        read afterwards. npy memory maps are released with the reader.
+        '''
+        for f in self._files:
+            f.close()
+        self._files = []
+
+    def _open(self, shard):
+        if self.file_format == "npy":
+            return tuple(
+                np.load(os.path.join(self.path, shard[key]), mmap_mode="r" if key == "iq" else None)
+                if key in shard else None
+                for key in ("iq", "label", "snr", "scale")
+            )
+        elif self.file_format == "hdf5":
+            if h5py is None:
+                raise ImportError("h5py is required to read HDF5 shards")
+            f = h5py.File(os.path.join(self.path, shard["file"]), "r")
+            self._files.append(f)
+            return f["iq"], f["label"][...], f["snr"][...], f["scale"][...] if "scale" in f else None
+        raise ValueError("Unknown dataset format: %s" % self.file_format)
+
+    def select(self, mod_names=None, snr_min=None, snr_max=None):
+        '''
+        View of the rows whose mod_name is in mod_names and whose snr_db is
+        within [snr_min, snr_max]. None leaves that criterion open, e.g.
+        select(get_dataset("fsk").keys(), snr_min=0).
+        '''
+        if mod_names is not None:
+            mod_names = set(mod_names)
+        segments = []
+        for (mod_name, snr_db), ranges in self.ranges.items():
+            if mod_names is not None and mod_name not in mod_names:
+                continue
+            if snr_min is not None and snr_db < snr_min:
+                continue
+            if snr_max is not None and snr_db > snr_max:
+                continue
+            segments.extend(ranges)
+        return dataset_view(self.shards, self.mod_names, sorted(segments), self.num_cplx_samples)
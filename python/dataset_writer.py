@@ -0,0 +1,309 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 
+# Copyright 2018 University of Arizona.
+# 
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+# 
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+from classify.generate_dataset import get_dataset, iter_dataset
+import numpy as np
+import abc
+import json
+import os
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# Integer types of the quantized IQ formats, named like SigMF's ci16_le/ci8
+quantized_types = {"ci16": np.int16, "ci8": np.int8}
+
+
+def quantize(iq, iq_dtype):
+    '''
+    Scales every exemplar of the float32 array iq, shaped
+    (rows, num_cplx_samples, 2), so its largest I or Q value hits full
+    scale of iq_dtype and rounds it. Returns (quantized iq, float32 scale)
+    with iq ~= quantized*scale[:, None, None].
+    '''
+    int_type = quantized_types[iq_dtype]
+    peak = np.abs(iq.reshape(len(iq), -1)).max(axis=1)
+    scale = (peak / np.iinfo(int_type).max).astype(np.float32)
+    scale[scale == 0] = 1
+    quantized = np.rint(iq / scale[:, np.newaxis, np.newaxis]).astype(int_type)
+    return quantized, scale
+
+
+class shard_writer(abc.ABCMeta("shard_writer_base", (object,), {})):
+    '''
+    Abstract base of the writers. Collects exemplars into shards of
+    shard_size rows and hands every full shard to _write_shard, which each
+    file format implements. close() flushes the last, possibly shorter,
+    shard and writes index.json, which lists the shards in order together
+    with the mod_name table the label codes refer to.
+
+    iq_dtype "ci16" or "ci8" stores IQ as int16 or int8 pairs with a
+    float32 scale per exemplar, a half or a quarter of the float32 size.
+    mod_names registers names up front so their codes do not depend on the
+    order in which they are first written.
+    '''
+    file_format = ""
+
+    def __init__(self, path, shard_size=65536, iq_dtype="float32", mod_names=()):
+        if iq_dtype != "float32" and iq_dtype not in quantized_types:
+            raise ValueError("Unknown IQ type: %s" % iq_dtype)
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        self.path = path
+        self.shard_size = shard_size
+        self.iq_dtype = iq_dtype
+        self.num_cplx_samples = None
+        self.mod_names = []
+        self.shards = []
+        self._codes = {}
+        self._fill = 0
+        for name in mod_names:
+            self._code(name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def write(self, iq_batch, labels, snr):
+        if self.num_cplx_samples is None:
+            self.num_cplx_samples = iq_batch.shape[1]
+            self._iq = np.empty((self.shard_size, self.num_cplx_samples, 2), dtype=np.float32)
+            self._label = np.empty(self.shard_size, dtype=np.int16)
+            self._snr = np.empty(self.shard_size, dtype=np.int8)
+
+        names, inverse = np.unique(labels, return_inverse=True)
+        codes = np.array([self._code(name) for name in names], dtype=np.int16)[inverse]
+        start = 0
+        while start < len(iq_batch):
+            take = min(self.shard_size - self._fill, len(iq_batch) - start)
+            self._iq[self._fill:self._fill + take] = iq_batch[start:start + take]
+            self._label[self._fill:self._fill + take] = codes[start:start + take]
+            self._snr[self._fill:self._fill + take] = snr[start:start + take]
+            self._fill += take
+            start += take
+            if self._fill == self.shard_size:
+                self.flush()
+
+    def flush(self):
+        if not self._fill:
+            return
+        columns = [("label", self._label[:self._fill]), ("snr", self._snr[:self._fill])]
+        if self.iq_dtype == "float32":
+            columns.insert(0, ("iq", self._iq[:self._fill]))
+        else:
+            quantized, scale = quantize(self._iq[:self._fill], self.iq_dtype)
+            columns[:0] = [("iq", quantized), ("scale", scale)]
+        shard = self._write_shard("shard_%05d" % len(self.shards), columns)
+        shard["rows"] = self._fill
+        self.shards.append(shard)
+        self._fill = 0
+
+    def close(self):
+        self.flush()
+        index = {
+            "format": self.file_format,
+            "iq_dtype": self.iq_dtype,
+            "num_cplx_samples": self.num_cplx_samples,
+            "mod_names": self.mod_names,
+            "shards": self.shards
+        }
+        with open(os.path.join(self.path, "index.json"), "w") as f:
+            json.dump(index, f, indent=2)
+
+    def _code(self, name):
+        name = str(name)
+        if name not in self._codes:
+            self._codes[name] = len(self.mod_names)
+            self.mod_names.append(name)
+        return self._codes[name]
+
+    @abc.abstractmethod
+    def _write_shard(self, name, columns):
+        '''
+        Stores the (key, array) pairs in columns: iq, the per-exemplar scale
+        when quantized, label and snr. Returns the index entry of the shard.
+        '''
+
+
+class npy_writer(shard_writer):
+    '''
+    Every shard is one .npy file per column (iq, label, snr and the scale
+    of quantized IQ) that can be opened with np.load(mmap_mode='r') without
+    copying.
+    '''
+    file_format = "npy"
+
+    def _write_shard(self, name, columns):
+        shard = {}
+        for key, data in columns:
+            shard[key] = "%s_%s.npy" % (name, key)
+            np.save(os.path.join(self.path, shard[key]), data)
+        return shard
+
+
+class hdf5_writer(shard_writer):
+    '''
+    Every shard is one HDF5 file holding iq, label and snr datasets. iq is
+    chunked chunk_rows exemplars at a time and compressed.
+    '''
+    file_format = "hdf5"
+
+    def __init__(self, path, shard_size=65536, iq_dtype="float32", mod_names=(),
+                 chunk_rows=1024, compression="gzip"):
+        if h5py is None:
+            raise ImportError("h5py is required to write HDF5 shards")
+        shard_writer.__init__(self, path, shard_size, iq_dtype, mod_names)
+        self.chunk_rows = chunk_rows
+        self.compression = compression
+
+    def _write_shard(self, name, columns):
+        shard = {"file": name + ".h5"}
+        with h5py.File(os.path.join(self.path, shard["file"]), "w") as f:
+            for key, data in columns:
+                if key == "iq":
+                    f.create_dataset(
+                        "iq", data=data,
+                        chunks=(min(self.chunk_rows, len(data)),) + data.shape[1:],
+                        compression=self.compression,
+                        shuffle=self.compression is not None
+                    )
+                else:
+                    f.create_dataset(key, data=data)
+        return shard
+
+
+class arrow_writer(shard_writer):
+    '''
+    One Arrow IPC file, dataset.arrow, with a record batch per shard. iq is
+    a FixedSizeList<float32> column of num_cplx_samples*2 interleaved I/Q
+    values (int16 or int8 plus a float32 scale column when quantized),
+    mod_name is dictionary encoded over the mod_names table and snr_db is
+    int8. An IPC file cannot change its dictionary, so every mod name has to
+    be known by the first shard, e.g. through mod_names.
+    '''
+    file_format = "arrow"
+    file_name = "dataset.arrow"
+
+    def __init__(self, path, shard_size=65536, iq_dtype="float32", mod_names=()):
+        if pa is None:
+            raise ImportError("pyarrow is required to write Arrow and Parquet files")
+        shard_writer.__init__(self, path, shard_size, iq_dtype, mod_names)
+        self._sink = None
+        self._num_names = None
+
+    def record_batch(self, columns):
+        arrays = []
+        names = []
+        for key, data in columns:
+            if key == "iq":
+                arrays.append(pa.FixedSizeListArray.from_arrays(
+                    pa.array(data.reshape(-1)), data.shape[1]*data.shape[2]
+                ))
+                names.append("iq")
+            elif key == "label":
+                arrays.append(pa.DictionaryArray.from_arrays(pa.array(data), pa.array(self.mod_names)))
+                names.append("mod_name")
+            elif key == "snr":
+                arrays.append(pa.array(data))
+                names.append("snr_db")
+            else:
+                arrays.append(pa.array(data))
+                names.append(key)
+        return pa.RecordBatch.from_arrays(arrays, names)
+
+    def close(self):
+        try:
+            shard_writer.close(self)
+        finally:
+            if self._sink is not None:
+                self._sink.close()
+                self._sink = None
+
+    def _write_shard(self, name, columns):
+        if self._num_names not in (None, len(self.mod_names)):
+            raise ValueError("New mod names after the first shard, pass every name in mod_names")
+        self._num_names = len(self.mod_names)
+        batch = self.record_batch(columns)
+        if self._sink is None:
+            self._sink = pa.RecordBatchFileWriter(os.path.join(self.path, self.file_name), batch.schema)
+        self._sink.write_batch(batch)
+        return {"file": self.file_name, "batch": len(self.shards)}
+
+
+class parquet_writer(arrow_writer):
+    '''
+    One Parquet file, dataset.parquet, with the columns of arrow_writer and
+    a row group per shard. Row groups keep min/max statistics, so readers
+    can skip the ones outside an SNR or mod_name predicate, e.g.
+    pq.read_table(path, filters=[("snr_db", ">=", 0)]). Unlike arrow_writer
+    the dictionary may grow from one row group to the next.
+    '''
+    file_format = "parquet"
+    file_name = "dataset.parquet"
+
+    def __init__(self, path, shard_size=65536, iq_dtype="float32", mod_names=(), compression="snappy"):
+        arrow_writer.__init__(self, path, shard_size, iq_dtype, mod_names)
+        self.compression = compression
+
+    def _write_shard(self, name, columns):
+        batch = self.record_batch(columns)
+        if self._sink is None:
+            self._sink = pq.ParquetWriter(
+                os.path.join(self.path, self.file_name), batch.schema,
+                compression=self.compression
+            )
+        self._sink.write_table(pa.Table.from_batches([batch]), row_group_size=batch.num_rows)
+        return {"file": self.file_name, "row_group": len(self.shards)}
+
+
+def get_writer(file_format, path, shard_size=65536, iq_dtype="float32", mod_names=()):
+    if file_format == "npy":
+        return npy_writer(path, shard_size, iq_dtype, mod_names)
+    elif file_format == "hdf5":
+        return hdf5_writer(path, shard_size, iq_dtype, mod_names)
+    elif file_format == "arrow":
+        return arrow_writer(path, shard_size, iq_dtype, mod_names)
+    elif file_format == "parquet":
+        return parquet_writer(path, shard_size, iq_dtype, mod_names)
+    raise ValueError("Unknown dataset format: %s" % file_format)
+
+
+def write_dataset(path, file_format="npy", shard_size=65536, iq_dtype="float32", **kwargs):
+    '''
+    Streams iter_dataset(**kwargs) into shards under path, so the sweep is
+    never held in memory as a whole. Each shard is written as soon as it
+    fills. Returns the closed writer.
+    '''
+    mod_names = get_dataset(kwargs.get("dataset", "all_tx")).keys()
+    writer = get_writer(file_format, path, shard_size, iq_dtype, mod_names)
+    with writer:
+        for iq_batch, labels, snr in iter_dataset(**kwargs):
+            writer.write(iq_batch, labels, snr)
+    return writer
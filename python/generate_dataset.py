@@ -20,204 +20,516 @@
 # 
 from classify.data_source import *
 from classify.channel import *
+from classify.dataset_builder import dataset_builder
+from classify.iq_dataset import snr_array
+from classify.batch_source import get_batch_source
+from classify.batch_channel import apply_channel_sweep, channel_history
+from classify.seeding import job_seeds
+from classify import sigmf_io
 from gnuradio import gr, blocks
 from numpy import random
-import pandas as pd
+import collections
+import multiprocessing
+import os
 import time
 
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
 
 def generate_dataset(channel_type="awgn",
                      snr_vals=range(-20, 20, 2),
                      num_cplx_samples=128,
                      num_exemplars_per_key=1000,
-                     dataset="all_tx"):
-    all_data = pd.DataFrame()
-    all_tx = get_dataset(dataset)
-
-    for idx_snr, snr_db in enumerate(snr_vals):
-        for idx_tx, tx_key in enumerate(all_tx.keys()):
-            # Make the top block with tx and channel
-            tb = gr.top_block()
-            snk = blocks.vector_sink_c()
-            max_data_len = 5*num_cplx_samples*num_exemplars_per_key + 500
-            limit = blocks.head(gr.sizeof_gr_complex, max_data_len)
-            chan = get_channel(channel_type, snr_db)
-            tb.connect(all_tx[tx_key], chan, limit, snk)
-            tb.start()
-            while len(snk.data()) < max_data_len:
-                time.sleep(.01)
-            tb.stop()
-
-            # Gather the data
-            raw_output_vector = np.array(snk.data(), dtype=np.complex64)
-
-            # start the sampler some random time after channel model transients (arbitrary values here)
-            random_idx = np.cumsum(random.randint(2*num_cplx_samples, 4*num_cplx_samples, size=(num_exemplars_per_key,))) + 500
-            data = np.zeros((num_exemplars_per_key,
-                             num_cplx_samples,
-                             2), dtype=np.float32)
-            for idx_exemplar, offset in enumerate(random_idx):
-                sampled_vector = raw_output_vector[offset:offset + num_cplx_samples]
-                energy = np.sum(np.abs(sampled_vector)**2)
-                sampled_vector = sampled_vector / energy
-                data[idx_exemplar, :, 0] = np.real(sampled_vector)
-                data[idx_exemplar, :, 1] = np.imag(sampled_vector)
-            mod_data = pd.DataFrame(data=data.reshape(num_exemplars_per_key, num_cplx_samples*2))
-            mod_data["mod_name"] = tx_key
-            mod_data["snr_db"] = snr_db
-            all_data = all_data.append(mod_data)
-    return all_data
-
-
-def get_channel(channel_string, snr_db):
+                     dataset="all_tx",
+                     timings=None,
+                     as_frame=True,
+                     workers=1,
+                     share_tx=False,
+                     engine="flowgraph",
+                     seed=None,
+                     record_path=None):
+    '''
+    If timings is a dict, the wall time of each capture is stored in it
+    keyed by (snr_db, tx_key). With as_frame=False an iq_dataset (complex64
+    iq, label codes, int8 snr_db) is returned instead of the legacy
+    DataFrame. With workers > 1 the jobs are captured in a pool of worker
+    processes, each with its own transmitters, and copied into the result
+    in the usual order.
+
+    With share_tx=True each transmitter runs once per sweep and its clean
+    output feeds one channel per SNR, instead of running the modulator
+    again for every SNR. The SNRs then share the underlying waveform, and
+    the capture time of a transmitter is split evenly across its SNRs.
+
+    engine="numpy" generates the exemplars with the batch engines of
+    batch_source and batch_channel instead of running flowgraphs. Combined
+    with share_tx, each transmitter then makes one clean batch and all SNRs
+    come from one fading realization plus one shared noise draw scaled per
+    SNR.
+
+    With a master seed, every job draws its payload, channels and sampler
+    offsets from child seeds of (tx, snr) (see seeding.job_seeds) and builds
+    its own transmitter, so the result is bit-reproducible for any number
+    of workers. Without one, the global numpy state and the fixed channel
+    seeds are used as before.
+
+    With record_path, the raw channel output of every (tx, snr) capture is
+    also streamed to a SigMF recording in that directory (see sigmf_io),
+    which can be re-windowed later with sigmf_io.recordings_to_dataset.
+    Only the flowgraph engine makes recordings.
+    '''
+    if record_path is not None:
+        if engine != "flowgraph":
+            raise ValueError("Only the flowgraph engine can record captures")
+        if not os.path.isdir(record_path):
+            os.makedirs(record_path)
+    all_tx = get_sources(dataset, engine)
+    builder = dataset_builder(all_tx.keys(), snr_vals, num_exemplars_per_key, num_cplx_samples)
+    if share_tx:
+        jobs = [(idx_tx, tx_key, list(enumerate(snr_vals)))
+                for idx_tx, tx_key in enumerate(all_tx.keys())]
+    else:
+        jobs = [(idx_tx, tx_key, [(idx_snr, snr_db)])
+                for idx_snr, snr_db in enumerate(snr_vals)
+                for idx_tx, tx_key in enumerate(all_tx.keys())]
+    seeds = [_job_seeds(seed, idx_tx, 0, snr_items) for idx_tx, tx_key, snr_items in jobs]
+
+    def record(tx_key, snr_items, capture_time):
+        if timings is not None:
+            for idx_snr, snr_db in snr_items:
+                timings[(snr_db, tx_key)] = capture_time/len(snr_items)
+
+    if workers > 1:
+        results = _run_jobs(
+            [(tx_key, channel_type, [snr_db for idx_snr, snr_db in snr_items],
+              num_cplx_samples, num_exemplars_per_key, engine, job_seed, record_path)
+             for (idx_tx, tx_key, snr_items), job_seed in zip(jobs, seeds)],
+            dataset, engine, workers
+        )
+        for (idx_tx, tx_key, snr_items), (outs, capture_time) in zip(jobs, results):
+            for (idx_snr, snr_db), data in zip(snr_items, outs):
+                builder.rows(idx_snr, idx_tx)[:] = data
+            record(tx_key, snr_items, capture_time)
+    else:
+        for (idx_tx, tx_key, snr_items), job_seed in zip(jobs, seeds):
+            capture_time = _run_job(
+                all_tx, tx_key, channel_type,
+                [snr_db for idx_snr, snr_db in snr_items],
+                [builder.rows(idx_snr, idx_tx) for idx_snr, snr_db in snr_items],
+                engine, job_seed, record_path
+            )
+            record(tx_key, snr_items, capture_time)
+
+    if as_frame:
+        return builder.to_dataframe()
+    return builder.to_dataset()
+
+
+def iter_dataset(channel_type="awgn",
+                 snr_vals=range(-20, 20, 2),
+                 num_cplx_samples=128,
+                 num_exemplars_per_key=1000,
+                 dataset="all_tx",
+                 batch_size=1024,
+                 workers=1,
+                 share_tx=False,
+                 engine="flowgraph",
+                 seed=None):
+    '''
+    Streaming counterpart of generate_dataset. Yields (iq_batch, labels, snr)
+    tuples of batch_size exemplars (the last one may be shorter), where
+    iq_batch is float32 of shape (batch, num_cplx_samples, 2), labels holds
+    the mod names and snr is int8. Each (snr, tx) pair is captured in chunks
+    of at most batch_size exemplars, so memory use depends on batch_size and
+    workers only, never on the size of the whole dataset. With share_tx a
+    job captures a chunk for every SNR at once, so it holds len(snr_vals)
+    chunks and memory grows with len(snr_vals) as well. seed works as in
+    generate_dataset, with every chunk a shard of its own.
+    '''
+    # snr is stored as int8, reject values that would wrap before capturing
+    snr_array(snr_vals)
+    all_tx = get_sources(dataset, engine)
+    names = np.array(list(all_tx.keys()))
+    chunks = list(enumerate(
+        min(batch_size, num_exemplars_per_key - start)
+        for start in range(0, num_exemplars_per_key, batch_size)
+    ))
+    if share_tx:
+        jobs = [(idx_tx, tx_key, list(enumerate(snr_vals)), shard, chunk)
+                for idx_tx, tx_key in enumerate(all_tx.keys())
+                for shard, chunk in chunks]
+    else:
+        jobs = [(idx_tx, tx_key, [(idx_snr, snr_db)], shard, chunk)
+                for idx_snr, snr_db in enumerate(snr_vals)
+                for idx_tx, tx_key in enumerate(all_tx.keys())
+                for shard, chunk in chunks]
+    worker_args = [
+        (tx_key, channel_type, [snr_db for idx_snr, snr_db in snr_items],
+         num_cplx_samples, chunk, engine, _job_seeds(seed, idx_tx, shard, snr_items), None)
+        for idx_tx, tx_key, snr_items, shard, chunk in jobs
+    ]
+
+    if workers > 1:
+        results = _run_jobs(worker_args, dataset, engine, workers)
+    else:
+        results = (_worker_job(args, all_tx) for args in worker_args)
+
+    def new_batch():
+        return (np.empty((batch_size, num_cplx_samples, 2), dtype=np.float32),
+                np.empty(batch_size, dtype=names.dtype),
+                np.empty(batch_size, dtype=np.int8))
+
+    iq_batch, labels, snr = new_batch()
+    fill = 0
+    for args, (outs, capture_time) in zip(worker_args, results):
+        tx_key, job_snr_vals = args[0], args[2]
+        for snr_db, data in zip(job_snr_vals, outs):
+            start = 0
+            while start < len(data):
+                take = min(batch_size - fill, len(data) - start)
+                iq_batch[fill:fill + take] = data[start:start + take]
+                labels[fill:fill + take] = tx_key
+                snr[fill:fill + take] = snr_db
+                fill += take
+                start += take
+                if fill == batch_size:
+                    yield iq_batch, labels, snr
+                    iq_batch, labels, snr = new_batch()
+                    fill = 0
+    if fill:
+        yield iq_batch[:fill], labels[:fill], snr[:fill]
+
+
+def generate_job(tx, channel_type, snr_vals, outs, seeds=None, record_files=None):
+    '''
+    Captures tx through one channel per value in snr_vals, all fed by the
+    same run of the transmitter, and fills the matching float32 array of
+    shape (num_exemplars, num_cplx_samples, 2) in outs. Returns the capture
+    time. seeds, a seeding.job_seeds, seeds the channels and the sampler.
+    record_files optionally names a file per SNR that receives the raw
+    channel output.
+    '''
+    num_exemplars, num_cplx_samples = outs[0].shape[:2]
+    max_data_len = 5*num_cplx_samples*num_exemplars + 500
+    if seeds is None:
+        chans = [get_channel(channel_type, snr_db) for snr_db in snr_vals]
+        sampler = random
+    else:
+        chans = [get_channel(channel_type, snr_db, *channel_seeds)
+                 for snr_db, channel_seeds in zip(snr_vals, seeds.channel_seeds)]
+        sampler = seeds.sampler()
+    start_time = time.time()
+    raw_output_vectors = capture_sweep(tx, chans, max_data_len, record_files)
+    capture_time = time.time() - start_time
+
+    for raw_output_vector, out in zip(raw_output_vectors, outs):
+        # start the sampler some random time after channel model transients (arbitrary values here)
+        random_idx = np.cumsum(sampler.randint(2*num_cplx_samples, 4*num_cplx_samples, size=(num_exemplars,))) + 500
+        extract_exemplars(raw_output_vector, random_idx, out)
+    return capture_time
+
+
+def generate_batch_job(src, channel_type, snr_vals, outs, seeds=None):
+    '''
+    numpy engine version of generate_job, where src is a batch_source
+    engine. One clean batch is generated and the whole SNR sweep is applied
+    to it with apply_channel_sweep, i.e. one modulator pass and a single
+    broadcast noise addition. Returns the generation time.
+    '''
+    num_exemplars, num_cplx_samples = outs[0].shape[:2]
+    tx_rng, channel_rng = (None, None) if seeds is None else (seeds.tx_rng(), seeds.sampler())
+    start_time = time.time()
+    clean = src.generate(num_exemplars, num_cplx_samples + channel_history(channel_type), tx_rng)
+    for noisy, out in zip(apply_channel_sweep(channel_type, clean, snr_vals, channel_rng), outs):
+        normalize_exemplars(noisy, out)
+    return time.time() - start_time
+
+
+def get_sources(dataset, engine="flowgraph"):
+    '''
+    The transmitters of dataset for the given engine: flowgraphs from
+    get_dataset, or their batch_source engines. The batch engine of a key
+    follows the transmitter class behind it, so where a dataset files a
+    transmitter under another name (ofdm-32-bpsk is tx_ofdm_16_bpsk in
+    "small") both engines still make the same waveform.
+    '''
+    flowgraphs = get_dataset(dataset)
+    if engine == "flowgraph":
+        return flowgraphs
+    elif engine == "numpy":
+        return collections.OrderedDict(
+            (tx_key, get_batch_source(_registry_key(flowgraphs.factory(tx_key))))
+            for tx_key in flowgraphs.keys()
+        )
+    raise ValueError("Unknown engine: %s" % engine)
+
+
+def _job_seeds(seed, idx_tx, shard, snr_items):
+    if seed is None:
+        return None
+    return job_seeds(seed, idx_tx, shard, [idx_snr for idx_snr, snr_db in snr_items])
+
+
+def _run_job(all_tx, tx_key, channel_type, snr_vals, outs, engine, seeds=None, record_path=None):
+    '''
+    Runs the job function of engine. A seeded flowgraph job builds its own
+    transmitter from seeds.tx_seed instead of reusing the one in all_tx.
+    With record_path, each capture is also saved as a SigMF recording.
+    '''
+    if engine == "numpy":
+        return generate_batch_job(all_tx[tx_key], channel_type, snr_vals, outs, seeds)
+    tx = all_tx[tx_key] if seeds is None else all_tx.build(tx_key, seeds.tx_seed)
+    if record_path is None:
+        return generate_job(tx, channel_type, snr_vals, outs, seeds)
+
+    bases = [sigmf_io.recording_base(record_path, tx_key, channel_type, snr_db) for snr_db in snr_vals]
+    capture_time = generate_job(tx, channel_type, snr_vals, outs, seeds,
+                                [base + ".sigmf-data" for base in bases])
+    for base, snr_db in zip(bases, snr_vals):
+        sigmf_io.write_meta(base, tx_key, channel_type, snr_db, seeds, all_tx.keys())
+    return capture_time
+
+
+# Transmitters owned by a pool worker, built once by _init_worker
+_worker_tx = None
+
+
+def _init_worker(dataset, engine):
+    global _worker_tx
+    # Forked workers inherit the parent's numpy state, so reseed to keep
+    # their samplers from drawing identical offsets
+    random.seed()
+    _worker_tx = get_sources(dataset, engine)
+
+
+def _worker_job(args, all_tx=None):
+    tx_key, channel_type, snr_vals, num_cplx_samples, num_exemplars_per_key, engine, seeds, record_path = args
+    if all_tx is None:
+        all_tx = _worker_tx
+    outs = [np.empty((num_exemplars_per_key, num_cplx_samples, 2), dtype=np.float32)
+            for snr_db in snr_vals]
+    capture_time = _run_job(all_tx, tx_key, channel_type, snr_vals, outs, engine, seeds, record_path)
+    return outs, capture_time
+
+
+def _run_jobs(worker_args, dataset, engine, workers):
+    '''
+    Runs _worker_job over worker_args in a process pool and yields the
+    results in order. At most 2*workers jobs are in flight, so a slow
+    consumer never lets finished captures pile up in memory.
+    '''
+    pool = multiprocessing.Pool(workers, _init_worker, (dataset, engine))
+    try:
+        pending = collections.deque()
+        for args in worker_args:
+            pending.append(pool.apply_async(_worker_job, (args,)))
+            if len(pending) >= 2*workers:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def extract_exemplars(raw_output_vector, offsets, out):
+    '''
+    Gathers the windows of raw_output_vector starting at offsets, divides
+    each by its energy and writes them into out, a float32 array of shape
+    (len(offsets), num_cplx_samples, 2), as interleaved I/Q.
+    '''
+    num_cplx_samples = out.shape[1]
+    windows = raw_output_vector[np.add.outer(offsets, np.arange(num_cplx_samples))]
+    return normalize_exemplars(windows, out)
+
+
+def normalize_exemplars(windows, out):
+    '''
+    Divides each row of the complex64 array windows by its energy and writes
+    the result into out as interleaved I/Q
+    '''
+    interleaved = windows.view(np.float32).reshape(len(windows), -1)
+    energy = np.einsum('ij,ij->i', interleaved, interleaved)
+    np.divide(windows, energy[:, np.newaxis], out=out.view(np.complex64)[:, :, 0])
+    return out
+
+
+def capture_sweep(tx, chans, num_samples, record_files=None):
+    '''
+    Runs tx, fanned out to every channel in chans, to completion and returns
+    the first num_samples output samples of each channel as a complex64
+    vector. The clean waveform is generated once, and blocks.head ends the
+    flowgraph, so every sink is read exactly once instead of being polled.
+    If record_files is given, the output of each channel is also streamed
+    to the matching file by a file sink while the flowgraph runs.
+    '''
+    tb = gr.top_block()
+    sinks = []
+    recorders = []
+    for idx, chan in enumerate(chans):
+        limit = blocks.head(gr.sizeof_gr_complex, num_samples)
+        snk = blocks.vector_sink_c()
+        tb.connect(tx, chan, limit, snk)
+        if record_files is not None:
+            recorder = blocks.file_sink(gr.sizeof_gr_complex, record_files[idx])
+            tb.connect(limit, recorder)
+            recorders.append(recorder)
+        sinks.append(snk)
+    tb.run()
+    # Flush the recordings now rather than whenever the sinks are collected
+    for recorder in recorders:
+        recorder.close()
+    return [np.array(snk.data(), dtype=np.complex64) for snk in sinks]
+
+
+def get_channel(channel_string, snr_db, noise_seed=0, fading_seed=0):
     if channel_string is "":
         return chan_none()
     elif channel_string == "awgn":
-        return chan_awgn(snr_db)
+        return chan_awgn(snr_db, noise_seed, fading_seed)
     elif channel_string == "flat_fading":
-        return chan_flat_fading(snr_db)
+        return chan_flat_fading(snr_db, noise_seed, fading_seed)
     elif channel_string == "selective_fading":
-        return chan_selective_fading(snr_db)
+        return chan_selective_fading(snr_db, noise_seed, fading_seed)
     elif channel_string == "radio_awgn":
-        return chan_radio_awgn(snr_db)
+        return chan_radio_awgn(snr_db, noise_seed, fading_seed)
     elif channel_string == "radio_flat_fading":
-        return chan_radio_flat_fading(snr_db)
+        return chan_radio_flat_fading(snr_db, noise_seed, fading_seed)
     elif channel_string == "radio_selective_fading":
-        return chan_radio_selective_fading(snr_db)
+        return chan_radio_selective_fading(snr_db, noise_seed, fading_seed)
+
+
+# Factory and family of every transmitter, in the order of get_dataset("all_tx")
+tx_registry = collections.OrderedDict([
+    ('ook', (tx_ook, 'constellation')),
+    ('bpsk', (tx_bpsk, 'constellation')),
+    ('4ask', (tx_4ask, 'constellation')),
+    ('4pam', (tx_4pam, 'constellation')),
+    ('8pam', (tx_8pam, 'constellation')),
+    ('8qam_circular', (tx_8qam_circular, 'constellation')),
+    ('8qam_cross', (tx_8qam_cross, 'constellation')),
+    ('16qam', (tx_16qam, 'constellation')),
+    ('16psk', (tx_16psk, 'constellation')),
+    ('32qam_cross', (tx_32qam_cross, 'constellation')),
+    ('32qam_rect', (tx_32qam_rect, 'constellation')),
+    ('64qam', (tx_64qam, 'constellation')),
+    ('2gfsk', (tx_2gfsk, 'fsk')),
+    ('4gfsk', (tx_4gfsk, 'fsk')),
+    ('8gfsk', (tx_8gfsk, 'fsk')),
+    ('2cpfsk', (tx_2cpfsk, 'fsk')),
+    ('4cpfsk', (tx_4cpfsk, 'fsk')),
+    ('8cpfsk', (tx_8cpfsk, 'fsk')),
+    ('ofdm-16-bpsk', (tx_ofdm_16_bpsk, 'ofdm')),
+    ('ofdm-32-bpsk', (tx_ofdm_32_bpsk, 'ofdm')),
+    ('ofdm-64-bpsk', (tx_ofdm_64_bpsk, 'ofdm')),
+    ('ofdm-16-qpsk', (tx_ofdm_16_qpsk, 'ofdm')),
+    ('ofdm-32-qpsk', (tx_ofdm_32_qpsk, 'ofdm')),
+    ('ofdm-64-qpsk', (tx_ofdm_64_qpsk, 'ofdm')),
+    ('am-dsb', (tx_am_dsb, 'data-bearing')),
+    ('am-ssb', (tx_am_ssb, 'data-bearing')),
+    ('wbfm', (tx_wbfm, 'data-bearing')),
+    ('lfm_sawtooth', (tx_lfm_sawtooth, 'radar')),
+    ('lfm_triangle', (tx_lfm_triangle, 'radar'))
+])
+
+
+class lazy_dataset(Mapping):
+    '''
+    Read-only mapping from tx key to transmitter. A transmitter is only
+    built, once, when its key is first looked up, so listing keys is free.
+    '''
+    def __init__(self, factories):
+        self._factories = collections.OrderedDict(factories)
+        self._built = {}
+
+    def __getitem__(self, tx_key):
+        if tx_key not in self._built:
+            self._built[tx_key] = self._factories[tx_key]()
+        return self._built[tx_key]
+
+    def __contains__(self, tx_key):
+        # Mapping would look the key up, and so build the transmitter
+        return tx_key in self._factories
+
+    def __iter__(self):
+        return iter(self._factories)
+
+    def __len__(self):
+        return len(self._factories)
+
+    def factory(self, tx_key):
+        '''
+        The transmitter class of tx_key, without building it
+        '''
+        return self._factories[tx_key]
+
+    def build(self, tx_key, seed):
+        '''
+        A new, uncached transmitter for tx_key seeded with seed
+        '''
+        return self._factories[tx_key](seed=seed)
+
+
+def _registry_key(factory):
+    '''
+    Key of factory in tx_registry
+    '''
+    for tx_key, (registered, family) in tx_registry.items():
+        if registered is factory:
+            return tx_key
+    raise KeyError(factory)
+
+
+def _family(*families):
+    return lazy_dataset(
+        (tx_key, factory) for tx_key, (factory, family) in tx_registry.items()
+        if family in families
+    )
+
+
+def _keys(*tx_keys):
+    return lazy_dataset((tx_key, tx_registry[tx_key][0]) for tx_key in tx_keys)
 
 
 def get_dataset(dataset_string):
     if dataset_string == "all_tx":
-        return {
-            'ook': tx_ook(),
-            'bpsk': tx_bpsk(),
-            '4ask': tx_4ask(),
-            '4pam': tx_4pam(),
-            '8pam': tx_8pam(),
-            '8qam_circular': tx_8qam_circular(),
-            '8qam_cross': tx_8qam_cross(),
-            '16qam': tx_16qam(),
-            '16psk': tx_16psk(),
-            '32qam_cross': tx_32qam_cross(),
-            '32qam_rect': tx_32qam_rect(),
-            '64qam': tx_64qam(),
-            '2gfsk': tx_2gfsk(),
-            '4gfsk': tx_4gfsk(),
-            '8gfsk': tx_8gfsk(),
-            '2cpfsk': tx_2cpfsk(),
-            '4cpfsk': tx_4cpfsk(),
-            '8cpfsk': tx_8cpfsk(),
-            'ofdm-16-bpsk': tx_ofdm_16_bpsk(),
-            'ofdm-32-bpsk': tx_ofdm_32_bpsk(),
-            'ofdm-64-bpsk': tx_ofdm_64_bpsk(),
-            'ofdm-16-qpsk': tx_ofdm_16_qpsk(),
-            'ofdm-32-qpsk': tx_ofdm_32_qpsk(),
-            'ofdm-64-qpsk': tx_ofdm_64_qpsk(),
-            'am-dsb': tx_am_dsb(),
-            'am-ssb': tx_am_ssb(),
-            'wbfm': tx_wbfm(),
-            'lfm_sawtooth': tx_lfm_sawtooth(),
-            'lfm_triangle': tx_lfm_triangle()
-        }
+        return _family('constellation', 'fsk', 'ofdm', 'data-bearing', 'radar')
     elif dataset_string == "small":
-        return {
-            'ook': tx_ook(),
-            'bpsk': tx_bpsk(),
-            '4pam': tx_4pam(),
-            '8qam_circular': tx_8qam_circular(),
-            '16qam': tx_16qam(),
-            'ofdm-32-bpsk': tx_ofdm_16_bpsk(),
-            '2gfsk': tx_2gfsk(),
-            '2cpfsk': tx_2cpfsk(),
-            'am-dsb': tx_am_dsb(),
-            'wbfm': tx_wbfm()
-        }
+        return lazy_dataset([
+            ('ook', tx_ook),
+            ('bpsk', tx_bpsk),
+            ('4pam', tx_4pam),
+            ('8qam_circular', tx_8qam_circular),
+            ('16qam', tx_16qam),
+            ('ofdm-32-bpsk', tx_ofdm_16_bpsk),
+            ('2gfsk', tx_2gfsk),
+            ('2cpfsk', tx_2cpfsk),
+            ('am-dsb', tx_am_dsb),
+            ('wbfm', tx_wbfm)
+        ])
     elif dataset_string == "ofdm":
-        return {
-            'ofdm-16-bpsk': tx_ofdm_16_bpsk(),
-            'ofdm-32-bpsk': tx_ofdm_32_bpsk(),
-            'ofdm-64-bpsk': tx_ofdm_64_bpsk(),
-            'ofdm-16-qpsk': tx_ofdm_16_qpsk(),
-            'ofdm-32-qpsk': tx_ofdm_32_qpsk(),
-            'ofdm-64-qpsk': tx_ofdm_64_qpsk()
-        }
+        return _family('ofdm')
     elif dataset_string == "constellation":
-        return {
-            'ook': tx_ook(),
-            'bpsk': tx_bpsk(),
-            '4ask': tx_4ask(),
-            '4pam': tx_4pam(),
-            '8pam': tx_8pam(),
-            '8qam_circular': tx_8qam_circular(),
-            '8qam_cross': tx_8qam_cross(),
-            '16qam': tx_16qam(),
-            '16psk': tx_16psk(),
-            '32qam_cross': tx_32qam_cross(),
-            '32qam_rect': tx_32qam_rect(),
-            '64qam': tx_64qam()
-        }
+        return _family('constellation')
     elif dataset_string == "fsk":
-        return {
-            '2gfsk': tx_2gfsk(),
-            '4gfsk': tx_4gfsk(),
-            '8gfsk': tx_8gfsk(),
-            '2cpfsk': tx_2cpfsk(),
-            '4cpfsk': tx_4cpfsk(),
-            '8cpfsk': tx_8cpfsk()
-        }
+        return _family('fsk')
     elif dataset_string == "analog":
-        return {
-            'am-dsb': tx_am_dsb(),
-            'am-ssb': tx_am_ssb(),
-            'wbfm': tx_wbfm(),
-            'lfm_sawtooth': tx_lfm_sawtooth(),
-            'lfm_triangle': tx_lfm_triangle()
-        }
+        return _family('data-bearing', 'radar')
 
 
 def get_hierarchy():
     return {
         'analog': {
-            'radar': {
-                'lfm_sawtooth': tx_lfm_sawtooth(),
-                'lfm_triangle': tx_lfm_triangle()
-            },
-            'data-bearing': {
-                'wbfm': tx_wbfm(),
-                'am-ssb': tx_am_ssb(),
-                'am-dsb': tx_am_dsb()
-            }
+            'radar': _family('radar'),
+            'data-bearing': _keys('wbfm', 'am-ssb', 'am-dsb')
         },
         'digital': {
-            'constellation': {
-                'ook': tx_ook(),
-                'bpsk': tx_bpsk(),
-                '4ask': tx_4ask(),
-                '4pam': tx_4pam(),
-                '8pam': tx_8pam(),
-                '8qam_circular': tx_8qam_circular(),
-                '8qam_cross': tx_8qam_cross(),
-                '16qam': tx_16qam(),
-                '16psk': tx_16psk(),
-                '32qam_cross': tx_32qam_cross(),
-                '32qam_rect': tx_32qam_rect(),
-                '64qam': tx_64qam()
-            },
-            'fsk': {
-                '2gfsk': tx_2gfsk(),
-                '4gfsk': tx_4gfsk(),
-                '8gfsk': tx_8gfsk(),
-                '2cpfsk': tx_2cpfsk(),
-                '4cpfsk': tx_4cpfsk(),
-                '8cpfsk': tx_8cpfsk()
-            },
-            'ofdm': {
-                'ofdm-16-bpsk': tx_ofdm_16_bpsk(),
-                'ofdm-32-bpsk': tx_ofdm_32_bpsk(),
-                'ofdm-64-bpsk': tx_ofdm_64_bpsk(),
-                'ofdm-16-qpsk': tx_ofdm_16_qpsk(),
-                'ofdm-32-qpsk': tx_ofdm_32_qpsk(),
-                'ofdm-64-qpsk': tx_ofdm_64_qpsk()
-            }
+            'constellation': _family('constellation'),
+            'fsk': _family('fsk'),
+            'ofdm': _family('ofdm')
         }
     }
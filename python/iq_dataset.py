@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 
+# Copyright 2018 University of Arizona.
+# 
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+# 
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+
+import numpy as np
+import pandas as pd
+
+try:
+    _string_types = basestring
+except NameError:
+    _string_types = str
+
+
+def snr_array(snr_db):
+    '''
+    snr_db as int8. Raises ValueError for values that int8 can not hold
+    exactly, i.e. fractional dB or anything outside [-128, 127].
+    '''
+    snr_db = np.asarray(snr_db)
+    limits = np.iinfo(np.int8)
+    if snr_db.size and (np.any(snr_db != np.round(snr_db)) or
+                        snr_db.min() < limits.min or snr_db.max() > limits.max):
+        raise ValueError("snr_db must be whole dB values in [%d, %d]" % (limits.min, limits.max))
+    return snr_db.astype(np.int8)
+
+class iq_dataset(object):
+    '''
+    In-memory dataset. iq is one contiguous complex64 array of shape
+    (num_exemplars, num_cplx_samples), label holds small integer codes into
+    the mod_names table and snr_db is int8, so nothing is stored per row as
+    a Python object.
+    '''
+    def __init__(self, iq, label, mod_names, snr_db):
+        self.iq = np.ascontiguousarray(iq, dtype=np.complex64)
+        self.label = np.asarray(label)
+        self.mod_names = list(mod_names)
+        self.snr_db = snr_array(snr_db)
+
+    def __len__(self):
+        return len(self.iq)
+
+    @property
+    def num_cplx_samples(self):
+        return self.iq.shape[1]
+
+    @property
+    def mod_name(self):
+        '''
+        Mod name of every row, looked up from the codes
+        '''
+        return np.array(self.mod_names)[self.label]
+
+    def select(self, mod_names=None, snr_min=None, snr_max=None):
+        '''
+        Copy of the rows with one of mod_names and snr_min <= snr_db <= snr_max.
+        A single name may be passed as a plain string.
+        '''
+        keep = np.ones(len(self), dtype=bool)
+        if isinstance(mod_names, _string_types):
+            mod_names = [mod_names]
+        if mod_names is not None:
+            # A name that is not in the table raises KeyError, like lazy_dataset
+            code_of = dict((mod_name, code) for code, mod_name in enumerate(self.mod_names))
+            codes = [code_of[mod_name] for mod_name in mod_names]
+            keep &= np.isin(self.label, codes)
+        if snr_min is not None:
+            keep &= self.snr_db >= snr_min
+        if snr_max is not None:
+            keep &= self.snr_db <= snr_max
+        return iq_dataset(self.iq[keep], self.label[keep], self.mod_names, self.snr_db[keep])
+
+    def to_dataframe(self):
+        '''
+        Legacy layout: num_cplx_samples*2 interleaved float columns followed
+        by a categorical mod_name and snr_db. The float columns share memory
+        with iq.
+        '''
+        frame = pd.DataFrame(self.iq.view(np.float32), copy=False)
+        frame["mod_name"] = pd.Categorical.from_codes(self.label, self.mod_names)
+        frame["snr_db"] = self.snr_db
+        return frame
+
+    def save(self, path):
+        '''
+        Writes the arrays to an uncompressed .npz file
+        '''
+        np.savez(path, iq=self.iq, label=self.label,
+                 mod_names=np.array(self.mod_names), snr_db=self.snr_db)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as arrays:
+            return cls(arrays["iq"], arrays["label"],
+                       [str(mod_name) for mod_name in arrays["mod_names"]],
+                       arrays["snr_db"])
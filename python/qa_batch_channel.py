@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 
+# Copyright 2018 University of Arizona.
+# 
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+# 
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+# 
+
+from gnuradio import gr, gr_unittest
+from gnuradio import blocks
+from batch_channel import awgn, noise_amplitude, apply_channel_sweep, channel_history
+from channel import chan_awgn
+import numpy as np
+
+class qa_batch_channel (gr_unittest.TestCase):
+
+    def test_001_awgn_variance (self):
+        rng = np.random.RandomState(0)
+        for snr_db in (-10, 0, 10, 20):
+            noise = awgn(np.zeros((8, 50000), dtype=np.complex64), snr_db, rng)
+            variance = 10.0 ** (-snr_db / 10.0)
+            self.assertLess(abs(np.mean(np.abs(noise)**2)/variance - 1), 0.01)
+            self.assertLess(abs(np.var(noise.real)/variance - 0.5), 0.01)
+            self.assertLess(abs(np.var(noise.imag)/variance - 0.5), 0.01)
+
+    def test_002_chan_awgn_variance (self):
+        # The flowgraph channel and the batch model add the same noise power
+        for snr_db in (-10, 0, 10):
+            tb = gr.top_block()
+            src = blocks.null_source(gr.sizeof_gr_complex)
+            chan = chan_awgn(snr_db, 3)
+            head = blocks.head(gr.sizeof_gr_complex, 200000)
+            snk = blocks.vector_sink_c()
+            tb.connect(src, chan, head, snk)
+            tb.run()
+            noise = np.array(snk.data())
+            self.assertLess(abs(np.mean(np.abs(noise)**2)/noise_amplitude(snr_db)**2 - 1), 0.02)
+
+    def test_003_sweep (self):
+        snr_vals = [-10, 0, 10, 20]
+        rng = np.random.RandomState(1)
+        iq = np.exp(2j*np.pi*rng.uniform(size=(4, 20000))).astype(np.complex64)
+        out = apply_channel_sweep("awgn", iq, snr_vals, rng)
+        self.assertEqual(out.shape, (4,) + iq.shape)
+        noise = out - iq
+        for noisy, snr_db in zip(noise, snr_vals):
+            self.assertLess(abs(np.mean(np.abs(noisy)**2)/noise_amplitude(snr_db)**2 - 1), 0.02)
+        # One noise draw is shared, only its amplitude changes with the SNR
+        unit = noise/noise_amplitude(snr_vals)[:, np.newaxis, np.newaxis]
+        self.assertTrue(np.allclose(unit, unit[0], atol=1e-3))
+        for channel_type in ("flat_fading", "selective_fading"):
+            out = apply_channel_sweep(channel_type, iq, snr_vals, rng)
+            self.assertEqual(out.shape, (4, 4, iq.shape[1] - channel_history(channel_type)))
+            # Every SNR is faded + amplitude*noise with the same fading and
+            # noise, so two of them determine the rest
+            amplitude = noise_amplitude(snr_vals)[:, np.newaxis, np.newaxis]
+            noise = (out[0] - out[3])/(amplitude[0] - amplitude[3])
+            faded = out[0] - amplitude[0]*noise
+            self.assertTrue(np.allclose(out, faded + amplitude*noise, atol=1e-4))
+            self.assertLess(abs(np.mean(np.abs(noise)**2) - 1), 0.02)
+
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_batch_channel, "qa_batch_channel.xml")
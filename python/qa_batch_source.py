@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 
+# Copyright 2018 University of Arizona.
+# 
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+# 
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+# 
+
+from gnuradio import gr, gr_unittest
+from gnuradio import blocks, filter, analog, digital, fft
+from gnuradio.filter import firdes
+from batch_source import rrc_taps, gaussian_taps, interpolate, gfsk_batch
+from batch_source import cpfsk_reference, cpfsk_batch, ofdm_batch
+from batch_source import am_dsb_batch, am_ssb_batch, get_batch_source
+import classify_swig as classify
+import numpy as np
+
+class qa_batch_source (gr_unittest.TestCase):
+
+    def test_001_rrc_taps (self):
+        # The resampler prototype of constellation_source, plus designs that
+        # hit the x3 = 0 limit (alpha=.25 at 8 sps) and alpha=1
+        for gain, fs, sym_rate, alpha, ntaps in ((32, 32, 1.0, .35, 704),
+                                                 (1, 2, 1.0, .5, 33),
+                                                 (1, 8, 1.0, .25, 64),
+                                                 (2, 4, 1.0, 1.0, 45)):
+            expected = np.array(firdes.root_raised_cosine(gain, fs, sym_rate, alpha, ntaps))
+            taps = rrc_taps(gain, fs, sym_rate, alpha, ntaps)
+            self.assertEqual(len(taps), len(expected))
+            self.assertTrue(np.allclose(taps, expected, rtol=1e-4, atol=1e-6*gain))
+
+    def test_002_gaussian_taps (self):
+        for gain, spb, bt, ntaps in ((1, 8, .35, 32), (2, 4, .5, 17)):
+            expected = np.array(firdes.gaussian(gain, spb, bt, ntaps))
+            self.assertTrue(np.allclose(gaussian_taps(gain, spb, bt, ntaps), expected, rtol=1e-5, atol=1e-7))
+
+    def test_003_gfsk_phase (self):
+        # The tx_4gfsk chain after its symbol mapper
+        batch = gfsk_batch(2)
+        taps = np.convolve(firdes.gaussian(1, 8, .35, 32), (1,)*8)
+        self.assertTrue(np.allclose(batch.taps, taps, atol=1e-6))
+        levels = batch.levels[np.random.RandomState(0).randint(0, 4, size=300)]
+        tb = gr.top_block()
+        src = blocks.vector_source_f(levels.tolist())
+        filt = filter.interp_fir_filter_fff(8, taps)
+        filt.declare_sample_delay(0)
+        mod = analog.frequency_modulator_fc(1)
+        snk = blocks.vector_sink_c()
+        tb.connect(src, filt, mod, snk)
+        tb.run()
+        freq = interpolate(levels[np.newaxis], batch.taps, 8)[0]
+        expected = np.exp(1j*np.cumsum(freq, dtype=np.float64))
+        self.assertEqual(len(snk.data()), len(expected))
+        self.assertComplexTuplesAlmostEqual(expected, snk.data(), 3)
+
+    def test_004_cpfsk_phase (self):
+        # The tx_4cpfsk chain, fed with known payload bytes
+        data = np.random.RandomState(1).randint(0, 256, size=200)
+        tb = gr.top_block()
+        src = blocks.vector_source_b(data.tolist())
+        pack = blocks.packed_to_unpacked_bb(2, gr.GR_MSB_FIRST)
+        mod = classify.cpfsk_bc(4.0, 1.0, 8, 2)
+        snk = blocks.vector_sink_c()
+        tb.connect(src, pack, mod, snk)
+        tb.run()
+        symbols = (data[:, np.newaxis] >> np.array([6, 4, 2, 0])) & 3
+        expected = cpfsk_reference(symbols.ravel(), 4.0, 1.0, 8, 2)
+        self.assertComplexTuplesAlmostEqual(expected, snk.data(), 3)
+
+    def test_005_cpfsk_batch (self):
+        batch = cpfsk_batch(3)
+        out = batch.generate(16, 1000, np.random.RandomState(2))
+        self.assertEqual(out.shape, (16, 1000))
+        self.assertTrue(np.allclose(np.abs(out), 1, atol=1e-5))
+        # Every step is one of the +-1, +-2, +-3, +-4 multiples of freq
+        freq = 4.0*np.pi/(8*3)
+        steps = np.angle(out[:, 1:]*np.conj(out[:, :-1]))/freq
+        self.assertTrue(np.allclose(steps, np.rint(steps), atol=1e-3))
+        self.assertEqual(set(np.rint(steps).astype(int).ravel()), set([-4, -3, -2, -1, 1, 2, 3, 4]))
+
+    def test_006_ofdm (self):
+        # The ofdm_source chain after its symbol mapper, for 32 carriers
+        fft_len, num_ofdm_symbols = 32, 10
+        points = np.array(digital.constellation_qpsk().base().points())
+        data = points[np.random.RandomState(4).randint(0, 4, size=(num_ofdm_symbols, fft_len//2))]
+        tb = gr.top_block()
+        src = blocks.vector_source_c(data.ravel().tolist())
+        null = blocks.null_source(gr.sizeof_gr_complex)
+        mux = blocks.stream_mux(gr.sizeof_gr_complex, (fft_len//4, fft_len//2, fft_len//4))
+        s2v = blocks.stream_to_vector(gr.sizeof_gr_complex, fft_len)
+        ifft = fft.fft_vcc(fft_len, False, (), True, 1)
+        cp = digital.ofdm_cyclic_prefixer(fft_len, fft_len + fft_len//4, 2, '')
+        mult = blocks.multiply_const_vcc((1.0/np.sqrt(fft_len/2), ))
+        head = blocks.head(gr.sizeof_gr_complex, num_ofdm_symbols*(fft_len + fft_len//4))
+        snk = blocks.vector_sink_c()
+        tb.connect(null, (mux, 0))
+        tb.connect(src, (mux, 1))
+        tb.connect(null, (mux, 2))
+        tb.connect(mux, s2v, ifft, cp, mult, head, snk)
+        tb.run()
+        expected = ofdm_batch(points, fft_len).modulate(data)
+        self.assertComplexTuplesAlmostEqual(expected, snk.data(), 5)
+
+    def test_007_lfm (self):
+        # Same tables as tx_lfm_triangle and tx_lfm_sawtooth
+        tables = {
+            'lfm_triangle': np.linspace(-.5, .5, 64),
+            'lfm_sawtooth': np.concatenate((np.linspace(-.5, .5, 32), np.linspace(.5, -.5, 32)))
+        }
+        for tx_key, table in tables.items():
+            tb = gr.top_block()
+            src = blocks.vector_source_f(table.tolist(), True)
+            fm = analog.frequency_modulator_fc(np.pi)
+            head = blocks.head(gr.sizeof_gr_complex, 1000)
+            snk = blocks.vector_sink_c()
+            tb.connect(src, fm, head, snk)
+            tb.run()
+            stream = np.array(snk.data())
+            out = get_batch_source(tx_key).generate(3, 500, np.random.RandomState(5))
+            # Redraw the offsets and phases generate() took from the same seed
+            rng = np.random.RandomState(5)
+            offsets = rng.randint(0, 64, size=3)
+            phases = rng.uniform(-np.pi, np.pi, size=3)
+            for row, offset, phase in zip(out, offsets, phases):
+                self.assertComplexTuplesAlmostEqual(stream[offset:offset + 500]*np.exp(1j*phase), row, 3)
+
+    def test_008_am (self):
+        rng = np.random.RandomState(6)
+        dsb = am_dsb_batch().generate(8, 4096, rng)
+        ssb = am_ssb_batch().generate(8, 4096, rng)
+        # DSB is real 1 + m with m band-limited to the resampled audio band
+        self.assertTrue(np.all(dsb.imag == 0))
+        self.assertAlmostEqual(dsb.real.mean(), 1, 1)
+        spectrum = np.abs(np.fft.rfft(dsb.real - 1, axis=-1))
+        cutoff = np.fft.rfftfreq(4096) > am_dsb_batch().cutoff
+        self.assertLess(spectrum[:, cutoff].max(), 1e-3*spectrum.max())
+        # SSB is the analytic signal of 1 + m, with no negative frequencies
+        spectrum = np.abs(np.fft.fft(ssb, axis=-1))
+        self.assertLess(spectrum[:, 4096//2 + 1:].max(), 1e-3*spectrum.max())
+
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_batch_source, "qa_batch_source.xml")
@@ -21,7 +21,9 @@
 
 from gnuradio import gr, gr_unittest
 from gnuradio import blocks
+from batch_source import cpfsk_reference
 import classify_swig as classify
+import numpy as np
 
 class qa_cpfsk_bc (gr_unittest.TestCase):
 
@@ -36,6 +38,77 @@ class qa_cpfsk_bc (gr_unittest.TestCase):
         self.tb.run ()
         # check data
 
+    def test_002_reference (self):
+        for bits_per_symbol in (1, 2, 3):
+            symbols = np.random.randint(0, 2**bits_per_symbol, 100)
+            src = blocks.vector_source_b(symbols.tolist(), False)
+            mod = classify.cpfsk_bc(4.0, 1.0, 8, bits_per_symbol)
+            snk = blocks.vector_sink_c()
+            tb = gr.top_block()
+            tb.connect(src, mod, snk)
+            tb.run()
+            expected = cpfsk_reference(symbols, 4.0, 1.0, 8, bits_per_symbol)
+            self.assertComplexTuplesAlmostEqual(expected, snk.data(), 3)
+
+    def test_003_long_run_accuracy (self):
+        # 1e5 random symbols against the float64 model. Accumulating the
+        # phase per sample in float, as before the step table, drifted to
+        # 2e-2 (bps=3) and 9e-2 (bps=1) over the same run
+        for bits_per_symbol in (1, 2, 3):
+            symbols = np.random.RandomState(bits_per_symbol).randint(0, 2**bits_per_symbol, 100000)
+            src = blocks.vector_source_b(symbols.tolist(), False)
+            mod = classify.cpfsk_bc(4.0, 1.0, 8, bits_per_symbol)
+            snk = blocks.vector_sink_c()
+            tb = gr.top_block()
+            tb.connect(src, mod, snk)
+            tb.run()
+            expected = cpfsk_reference(symbols, 4.0, 1.0, 8, bits_per_symbol)
+            self.assertEqual(len(snk.data()), len(expected))
+            self.assertLess(np.abs(np.array(snk.data()) - expected).max(), 1e-4)
+
+    def test_004_long_run (self):
+        # With k = sqrt(2) no step is a rational fraction of 2pi, so every
+        # wrap of the running phase is inexact. Over 1e6 samples of random
+        # symbols the phase must still match the float64 model, which only
+        # differs by the float32 rounding of each sample's phase
+        k = float(np.float32(np.sqrt(2.0)))  # as the block receives it
+        for bits_per_symbol in (1, 3):
+            symbols = np.random.RandomState(7).randint(0, 2**bits_per_symbol, 125000)
+            src = blocks.vector_source_b(symbols.tolist(), False)
+            mod = classify.cpfsk_bc(k, 1.0, 8, bits_per_symbol)
+            snk = blocks.vector_sink_c()
+            tb = gr.top_block()
+            tb.connect(src, mod, snk)
+            tb.run()
+            expected = cpfsk_reference(symbols, k, 1.0, 8, bits_per_symbol)
+            phase_error = np.abs(np.angle(np.array(snk.data())*np.conj(expected)))
+            self.assertEqual(len(phase_error), 1000000)
+            self.assertLess(phase_error.max(), 1e-4)
+
+    def test_005_nco (self):
+        # The lookup rounds the phase to the nearest of 2^bits entries, at
+        # most pi/2^bits off. Each step is rounded to a 32-bit word, which
+        # can add up to pi/2^32 per sample over the run
+        for table_bits in (8, 12, 16):
+            for bits_per_symbol in (1, 2, 3):
+                symbols = np.random.RandomState(bits_per_symbol).randint(0, 2**bits_per_symbol, 10000)
+                src = blocks.vector_source_b(symbols.tolist(), False)
+                mod = classify.cpfsk_bc(4.0, 1.0, 8, bits_per_symbol, True, table_bits)
+                snk = blocks.vector_sink_c()
+                tb = gr.top_block()
+                tb.connect(src, mod, snk)
+                tb.run()
+                out = np.array(snk.data())
+                expected = cpfsk_reference(symbols, 4.0, 1.0, 8, bits_per_symbol)
+                bound = np.pi/2**table_bits + len(out)*np.pi/2**32 + 1e-6
+                self.assertLess(np.abs(np.angle(out*np.conj(expected))).max(), bound)
+                self.assertLess(np.abs(np.abs(out) - 1).max(), 1e-6)
+
+    def test_006_nco_table_bits (self):
+        # SWIG turns the std::invalid_argument into a RuntimeError
+        for table_bits in (0, 25, 32):
+            self.assertRaises(RuntimeError, classify.cpfsk_bc, 4.0, 1.0, 8, 1, True, table_bits)
+
 
 if __name__ == '__main__':
     gr_unittest.run(qa_cpfsk_bc, "qa_cpfsk_bc.xml")
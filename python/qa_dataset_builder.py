@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 
+# Copyright 2018 University of Arizona.
+# 
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+# 
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+# 
+
+from gnuradio import gr_unittest
+from dataset_builder import dataset_builder
+import numpy as np
+
+class qa_dataset_builder (gr_unittest.TestCase):
+
+    def test_001_layout (self):
+        builder = dataset_builder(["a", "b", "c"], [-10, 0, 10], 4, 16)
+        for idx_snr in range(3):
+            for idx_tx in range(3):
+                builder.rows(idx_snr, idx_tx)[:] = 10*idx_snr + idx_tx
+        # Rows are SNR-major with num_exemplars_per_key rows per pair
+        self.assertEqual(builder.data.shape, (36, 16, 2))
+        expected = np.repeat(10*np.repeat(np.arange(3), 3) + np.tile(np.arange(3), 3), 4)
+        self.assertTrue(np.array_equal(builder.data[:, 0, 0], expected))
+        self.assertTrue(np.array_equal(builder.label, np.tile(np.repeat(np.arange(3), 4), 3)))
+        self.assertTrue(np.array_equal(builder.snr_db, np.repeat([-10, 0, 10], 12)))
+        self.assertEqual(builder.snr_db.dtype, np.int8)
+
+    def test_002_views (self):
+        builder = dataset_builder(["a", "b"], [0, 2], 3, 8)
+        builder.rows(1, 0)[:, :, 0] = 1
+        builder.rows(1, 0)[:, :, 1] = -2
+        dataset = builder.to_dataset()
+        self.assertEqual(dataset.iq.shape, (12, 8))
+        self.assertTrue(np.all(dataset.iq[6:9] == 1 - 2j))
+        self.assertTrue(np.all(dataset.iq[:6] == 0))
+        frame = builder.to_dataframe()
+        self.assertEqual(list(frame["mod_name"][:6]), ["a"]*3 + ["b"]*3)
+        self.assertEqual(list(frame["snr_db"][6:]), [2]*6)
+        # The dataset and the float columns share memory with the builder
+        builder.data[0, 0, 0] = 5
+        self.assertEqual(dataset.iq[0, 0], 5)
+        self.assertEqual(frame[0][0], 5)
+
+    def test_003_snr_range (self):
+        for snr_vals in ([-20, 200], [-200, 0], [0.5, 1]):
+            self.assertRaises(ValueError, dataset_builder, ["a"], snr_vals, 1, 8)
+        builder = dataset_builder(["a"], [-128, 127, 4.0], 1, 8)
+        self.assertEqual(list(builder.snr_db), [-128, 127, 4])
+
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_dataset_builder, "qa_dataset_builder.xml")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 
+# Copyright 2018 University of Arizona.
+# 
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+# 
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+# 
+
+from gnuradio import gr_unittest
+from classify import dataset_writer
+from classify.dataset_writer import get_writer
+from classify.dataset_reader import dataset_reader
+import numpy as np
+import shutil
+import tempfile
+
+class qa_dataset_reader (gr_unittest.TestCase):
+
+    def setUp (self):
+        self.path = tempfile.mkdtemp()
+        rng = np.random.RandomState(1)
+        self.iq = rng.randn(40, 16, 2).astype(np.float32)
+        self.labels = np.tile(np.repeat(["a", "b"], 5), 4)
+        self.snr = np.repeat(np.array([0, 10], dtype=np.int8), 20)
+
+    def tearDown (self):
+        shutil.rmtree(self.path)
+
+    def write (self, file_format):
+        with get_writer(file_format, self.path, 16) as writer:
+            writer.write(self.iq, self.labels, self.snr)
+
+    def check_batch (self, file_format):
+        self.write(file_format)
+        with dataset_reader(self.path) as reader:
+            # Unsorted, repeated and spread over every shard
+            indices = [39, 3, 3, 17, 0, 39, 16, 2]
+            iq, labels, snr = reader.batch(indices)
+            self.assertTrue(np.array_equal(iq, self.iq[indices]))
+            self.assertTrue(np.array_equal(np.array(reader.mod_names)[labels], self.labels[indices]))
+            self.assertTrue(np.array_equal(snr, self.snr[indices]))
+
+            view = reader.select(["b"], snr_min=10)
+            self.assertEqual(len(view), 10)
+            iq, labels, snr = view.batch([9, 0, 9])
+            rows = np.flatnonzero((self.labels == "b") & (self.snr == 10))[[9, 0, 9]]
+            self.assertTrue(np.array_equal(iq, self.iq[rows]))
+
+            for view in (reader, reader.select(["c"])):
+                iq, labels, snr = view.batch([])
+                self.assertEqual(iq.shape, (0, 16, 2))
+                self.assertEqual(len(labels), 0)
+                self.assertEqual(len(snr), 0)
+
+    def test_001_npy (self):
+        self.check_batch("npy")
+
+    def test_002_hdf5 (self):
+        if dataset_writer.h5py is None:
+            self.skipTest("h5py is not installed")
+        self.check_batch("hdf5")
+        reader = dataset_reader(self.path)
+        reader.close()
+        self.assertRaises(Exception, reader.batch, [0])
+
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_dataset_reader, "qa_dataset_reader.xml")
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 
+# Copyright 2018 University of Arizona.
+# 
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+# 
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+# 
+
+from gnuradio import gr_unittest
+from classify import dataset_writer
+from classify.dataset_writer import get_writer, shard_writer
+from classify.dataset_reader import dataset_reader
+import numpy as np
+import os
+import shutil
+import tempfile
+
+class qa_dataset_writer (gr_unittest.TestCase):
+
+    def setUp (self):
+        self.path = tempfile.mkdtemp()
+        rng = np.random.RandomState(0)
+        self.iq = rng.randn(50, 32, 2).astype(np.float32)
+        self.labels = np.array(["bpsk"]*20 + ["16qam"]*30)
+        self.snr = np.repeat(np.array([-4, 0, 6, 10, 20], dtype=np.int8), 10)
+
+    def tearDown (self):
+        shutil.rmtree(self.path)
+
+    def round_trip (self, file_format, iq_dtype="float32"):
+        with get_writer(file_format, self.path, 16, iq_dtype, mod_names=["16qam"]) as writer:
+            writer.write(self.iq[:7], self.labels[:7], self.snr[:7])
+            writer.write(self.iq[7:], self.labels[7:], self.snr[7:])
+        with dataset_reader(self.path) as reader:
+            self.assertEqual(reader.mod_names, ["16qam", "bpsk"])
+            self.assertEqual(len(reader), 50)
+            self.assertEqual(len(reader.shards), 4)
+            self.assertEqual(reader.ranges[("bpsk", 0)], [(0, 10, 16), (1, 0, 4)])
+            iq, labels, snr = reader.batch(np.arange(50))
+            row = reader[23][0]
+            self.assertEqual(reader.shards[0][0].dtype,
+                             np.dtype(dataset_writer.quantized_types.get(iq_dtype, iq_dtype)))
+        self.assertTrue(np.array_equal(np.array(reader.mod_names)[labels], self.labels))
+        self.assertTrue(np.array_equal(snr, self.snr))
+        return iq, row
+
+    def test_001_abstract (self):
+        self.assertRaises(TypeError, shard_writer, self.path)
+
+    def test_002_npy (self):
+        iq, row = self.round_trip("npy")
+        self.assertTrue(np.array_equal(iq, self.iq))
+        self.assertTrue(np.array_equal(row, self.iq[23]))
+
+    def test_003_hdf5 (self):
+        if dataset_writer.h5py is None:
+            self.skipTest("h5py is not installed")
+        iq, row = self.round_trip("hdf5")
+        self.assertTrue(np.array_equal(iq, self.iq))
+
+    def assert_quantized (self, iq, iq_dtype):
+        # Rounding to the nearest step of scale = peak/max is off by at most
+        # half a step, plus the float32 rounding of scale and of the product,
+        # a few ulps of peak
+        peak = np.abs(self.iq.reshape(50, -1)).max(axis=1)
+        step = peak / np.iinfo(iq_dtype).max
+        error = np.abs(iq - self.iq).reshape(50, -1).max(axis=1)
+        self.assertTrue(np.all(error <= step/2 + peak*2.0**-21))
+        self.assertEqual(iq.dtype, np.float32)
+
+    def test_004_npy_quantized (self):
+        for iq_dtype, int_type in (("ci16", np.int16), ("ci8", np.int8)):
+            iq, row = self.round_trip("npy", iq_dtype)
+            self.assert_quantized(iq, int_type)
+            self.assertTrue(np.array_equal(row, iq[23]))
+            shutil.rmtree(self.path)
+            self.path = tempfile.mkdtemp()
+
+    def test_005_hdf5_quantized (self):
+        if dataset_writer.h5py is None:
+            self.skipTest("h5py is not installed")
+        for iq_dtype, int_type in (("ci16", np.int16), ("ci8", np.int8)):
+            iq, row = self.round_trip("hdf5", iq_dtype)
+            self.assert_quantized(iq, int_type)
+            self.assertTrue(np.array_equal(row, iq[23]))
+            shutil.rmtree(self.path)
+            self.path = tempfile.mkdtemp()
+
+    def arrow_round_trip (self, file_format, iq_dtype="float32"):
+        # dataset_reader only opens npy and hdf5, so read back with pyarrow
+        pa, pq = dataset_writer.pa, dataset_writer.pq
+        with get_writer(file_format, self.path, 16, iq_dtype, mod_names=["16qam"]) as writer:
+            writer.write(self.iq[:7], self.labels[:7], self.snr[:7])
+            writer.write(self.iq[7:], self.labels[7:], self.snr[7:])
+        file_name = os.path.join(self.path, "dataset." + file_format)
+        if file_format == "arrow":
+            reader = pa.RecordBatchFileReader(pa.OSFile(file_name))
+            self.assertEqual(reader.num_record_batches, 4)
+            table = reader.read_all()
+        else:
+            parquet = pq.ParquetFile(file_name)
+            self.assertEqual(parquet.num_row_groups, 4)
+            table = parquet.read()
+        int_type = dataset_writer.quantized_types.get(iq_dtype, np.float32)
+        self.assertEqual(table.schema.field("iq").type.value_type, pa.from_numpy_dtype(int_type))
+        iq = np.array(table.column("iq").to_pylist(), dtype=np.float32).reshape(50, 32, 2)
+        if iq_dtype != "float32":
+            iq *= np.array(table.column("scale").to_pylist(), dtype=np.float32)[:, np.newaxis, np.newaxis]
+        self.assertEqual(table.column("mod_name").to_pylist(), list(self.labels))
+        self.assertEqual(table.column("snr_db").to_pylist(), list(self.snr))
+        return iq
+
+    def test_006_arrow (self):
+        if dataset_writer.pa is None:
+            self.skipTest("pyarrow is not installed")
+        self.assertTrue(np.array_equal(self.arrow_round_trip("arrow"), self.iq))
+        for iq_dtype, int_type in (("ci16", np.int16), ("ci8", np.int8)):
+            shutil.rmtree(self.path)
+            self.path = tempfile.mkdtemp()
+            self.assert_quantized(self.arrow_round_trip("arrow", iq_dtype), int_type)
+
+    def test_007_parquet (self):
+        if dataset_writer.pa is None:
+            self.skipTest("pyarrow is not installed")
+        self.assertTrue(np.array_equal(self.arrow_round_trip("parquet"), self.iq))
+        for iq_dtype, int_type in (("ci16", np.int16), ("ci8", np.int8)):
+            shutil.rmtree(self.path)
+            self.path = tempfile.mkdtemp()
+            self.assert_quantized(self.arrow_round_trip("parquet", iq_dtype), int_type)
+
+    def test_008_arrow_close (self):
+        if dataset_writer.pa is None:
+            self.skipTest("pyarrow is not installed")
+        # A mod name first seen in the last shard makes the final flush
+        # raise; the Arrow file still has to be closed
+        writer = get_writer("arrow", self.path, 16)
+        writer.write(self.iq[20:36], self.labels[20:36], self.snr[20:36])
+        writer.write(self.iq[:7], self.labels[:7], self.snr[:7])
+        self.assertRaises(ValueError, writer.close)
+        self.assertTrue(writer._sink is None)
+        reader = dataset_writer.pa.RecordBatchFileReader(
+            dataset_writer.pa.OSFile(os.path.join(self.path, "dataset.arrow")))
+        self.assertEqual(reader.num_record_batches, 1)
+
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_dataset_writer, "qa_dataset_writer.xml")
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 
+# Copyright 2018 University of Arizona.
+# 
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+# 
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+# 
+
+from gnuradio import gr_unittest
+from classify.generate_dataset import extract_exemplars, generate_dataset, get_dataset, get_hierarchy, \
+    get_sources, iter_dataset, lazy_dataset, tx_registry
+import collections
+import numpy as np
+
+class counting_factory(object):
+    '''
+    Stands in for a transmitter class and records the seed of every build
+    '''
+    def __init__(self):
+        self.seeds = []
+
+    def __call__(self, seed=None):
+        self.seeds.append(seed)
+        return object()
+
+class qa_generate_dataset (gr_unittest.TestCase):
+
+    params = dict(snr_vals=[0, 10], num_cplx_samples=64, num_exemplars_per_key=6,
+                  dataset="small", engine="numpy", seed=5)
+
+    def iter_rows (self, **kwargs):
+        batches = list(iter_dataset(**kwargs))
+        iq = np.concatenate([iq_batch for iq_batch, labels, snr in batches])
+        labels = np.concatenate([labels for iq_batch, labels, snr in batches])
+        snr = np.concatenate([snr for iq_batch, labels, snr in batches])
+        return iq.view(np.complex64)[:, :, 0], labels, snr
+
+    def test_001_extract_exemplars (self):
+        rng = np.random.RandomState(0)
+        raw = (rng.randn(5000) + 1j*rng.randn(5000)).astype(np.complex64)
+        offsets = np.cumsum(rng.randint(256, 512, size=10)) + 100
+        out = np.empty((10, 128, 2), dtype=np.float32)
+        extract_exemplars(raw, offsets, out)
+        # Per-exemplar loop of the original implementation
+        for exemplar, offset in zip(out, offsets):
+            window = raw[offset:offset + 128]
+            expected = window/np.sum(np.abs(window)**2)
+            self.assertTrue(np.allclose(exemplar[:, 0], expected.real, rtol=1e-5, atol=1e-8))
+            self.assertTrue(np.allclose(exemplar[:, 1], expected.imag, rtol=1e-5, atol=1e-8))
+
+    def test_002_iter_dataset (self):
+        # With one chunk per (snr, tx) pair both share the job seeds
+        dataset = generate_dataset(as_frame=False, **self.params)
+        iq, labels, snr = self.iter_rows(batch_size=6, **self.params)
+        self.assertTrue(np.array_equal(iq, dataset.iq))
+        self.assertTrue(np.array_equal(labels, dataset.mod_name))
+        self.assertTrue(np.array_equal(snr, dataset.snr_db))
+
+    def test_003_iter_dataset_share_tx (self):
+        # share_tx yields transmitter by transmitter, so compare per key
+        dataset = generate_dataset(as_frame=False, share_tx=True, **self.params)
+        iq, labels, snr = self.iter_rows(batch_size=6, share_tx=True, **self.params)
+        self.assertEqual(len(iq), len(dataset))
+        for mod_name in dataset.mod_names:
+            for snr_db in self.params["snr_vals"]:
+                rows = (labels == mod_name) & (snr == snr_db)
+                expected = (dataset.mod_name == mod_name) & (dataset.snr_db == snr_db)
+                self.assertEqual(rows.sum(), 6)
+                self.assertTrue(np.array_equal(iq[rows], dataset.iq[expected]))
+
+    def test_004_seeded_workers (self):
+        # Every job has its own child seeds, so the pool does not matter
+        one = generate_dataset(as_frame=False, workers=1, **self.params)
+        two = generate_dataset(as_frame=False, workers=2, **self.params)
+        self.assertTrue(np.array_equal(one.iq, two.iq))
+        iq_one = self.iter_rows(batch_size=4, workers=1, share_tx=True, **self.params)[0]
+        iq_two = self.iter_rows(batch_size=4, workers=2, share_tx=True, **self.params)[0]
+        self.assertTrue(np.array_equal(iq_one, iq_two))
+        other = generate_dataset(as_frame=False, **dict(self.params, seed=6))
+        self.assertFalse(np.array_equal(one.iq, other.iq))
+
+    def test_005_flowgraph_share_tx (self):
+        # One transmitter run fans out through capture_sweep to a channel per
+        # SNR, each seeded from its own (tx, snr) child seeds
+        params = dict(self.params, num_cplx_samples=32, num_exemplars_per_key=3,
+                      engine="flowgraph", share_tx=True)
+        one = generate_dataset(as_frame=False, **params)
+        two = generate_dataset(as_frame=False, **params)
+        self.assertEqual(one.iq.shape, (len(one.mod_names)*2*3, 32))
+        self.assertEqual(one.iq.dtype, np.complex64)
+        self.assertTrue(np.array_equal(one.iq, two.iq))
+        self.assertTrue(np.array_equal(one.label, two.label))
+        self.assertTrue(np.array_equal(one.snr_db, two.snr_db))
+        for mod_name in one.mod_names:
+            rows = [one.iq[(one.mod_name == mod_name) & (one.snr_db == snr_db)]
+                    for snr_db in params["snr_vals"]]
+            self.assertEqual([len(iq) for iq in rows], [3, 3])
+            self.assertFalse(np.array_equal(rows[0], rows[1]))
+        other = generate_dataset(as_frame=False, **dict(params, seed=6))
+        self.assertFalse(np.array_equal(one.iq, other.iq))
+
+    def test_006_ofdm_parity (self):
+        # "small" files tx_ofdm_16_bpsk, a 32 point FFT, as ofdm-32-bpsk
+        self.assertEqual(get_sources("small", "numpy")["ofdm-32-bpsk"].fft_len, 32)
+        for dataset in ("all_tx", "small", "ofdm"):
+            flowgraphs = get_sources(dataset)
+            batches = get_sources(dataset, "numpy")
+            tx_keys = [tx_key for tx_key in flowgraphs if tx_key.startswith("ofdm")]
+            self.assertTrue(tx_keys)
+            for tx_key in tx_keys:
+                self.assertEqual(batches[tx_key].fft_len, flowgraphs[tx_key].fft_len)
+                self.assertTrue(np.allclose(batches[tx_key].points, flowgraphs[tx_key].const.points()))
+
+    def test_007_lazy_dataset (self):
+        factories = collections.OrderedDict((tx_key, counting_factory()) for tx_key in ("bpsk", "wbfm"))
+        dataset = lazy_dataset(factories)
+        self.assertEqual(list(dataset.keys()), ["bpsk", "wbfm"])
+        self.assertEqual(len(dataset), 2)
+        self.assertTrue("bpsk" in dataset)
+        self.assertFalse("16qam" in dataset)
+        self.assertTrue(dataset.factory("wbfm") is factories["wbfm"])
+        self.assertEqual([factory.seeds for factory in factories.values()], [[], []])
+
+        tx = dataset["bpsk"]
+        self.assertTrue(dataset["bpsk"] is tx)
+        self.assertEqual(factories["bpsk"].seeds, [None])
+        # build bypasses the cache, in both directions
+        seeded = dataset.build("bpsk", 7)
+        self.assertFalse(seeded is tx)
+        self.assertFalse(dataset.build("bpsk", 7) is seeded)
+        self.assertTrue(dataset["bpsk"] is tx)
+        self.assertEqual(factories["bpsk"].seeds, [None, 7, 7])
+        self.assertEqual(factories["wbfm"].seeds, [])
+        self.assertRaises(KeyError, dataset.__getitem__, "16qam")
+
+    def test_008_lazy_registry (self):
+        # Listing datasets and walking the hierarchy must not build anything
+        saved = tx_registry.copy()
+        try:
+            for tx_key, (factory, family) in saved.items():
+                tx_registry[tx_key] = (counting_factory(), family)
+            for dataset in ("all_tx", "small", "ofdm", "constellation", "fsk", "analog"):
+                self.assertTrue(list(get_dataset(dataset).keys()))
+            hierarchy = get_hierarchy()
+            leaves = [tx_key for group in hierarchy.values() for family in group.values() for tx_key in family]
+            self.assertEqual(sorted(leaves), sorted(tx_registry.keys()))
+            self.assertEqual(list(hierarchy['analog']['data-bearing']), ['wbfm', 'am-ssb', 'am-dsb'])
+            self.assertEqual([factory.seeds for factory, family in tx_registry.values()], [[]]*len(tx_registry))
+            factory = tx_registry['wbfm'][0]
+            hierarchy['analog']['data-bearing']['wbfm']
+            self.assertEqual(factory.seeds, [None])
+        finally:
+            tx_registry.update(saved)
+
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_generate_dataset, "qa_generate_dataset.xml")
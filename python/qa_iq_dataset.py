@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 
+# Copyright 2018 University of Arizona.
+# 
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+# 
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+# 
+
+from gnuradio import gr_unittest
+from iq_dataset import iq_dataset
+import numpy as np
+import os
+import shutil
+import tempfile
+
+class qa_iq_dataset (gr_unittest.TestCase):
+
+    def setUp (self):
+        rng = np.random.RandomState(0)
+        iq = (rng.randn(12, 16) + 1j*rng.randn(12, 16)).astype(np.complex64)
+        self.dataset = iq_dataset(iq, np.tile([0, 1, 2], 4), ["bpsk", "qpsk", "8psk"],
+                                  np.repeat([-10, 0, 10, 20], 3))
+
+    def test_001_select (self):
+        subset = self.dataset.select(["qpsk", "8psk"], snr_min=0, snr_max=10)
+        self.assertEqual(len(subset), 4)
+        self.assertEqual(list(subset.mod_name), ["qpsk", "8psk"]*2)
+        self.assertEqual(list(subset.snr_db), [0, 0, 10, 10])
+        self.assertTrue(np.array_equal(subset.iq, self.dataset.iq[[4, 5, 7, 8]]))
+        self.assertEqual(subset.mod_names, self.dataset.mod_names)
+
+    def test_002_select_unknown (self):
+        with self.assertRaises(KeyError) as context:
+            self.dataset.select(["qpsk", "16qam"])
+        self.assertEqual(context.exception.args, ("16qam",))
+
+    def test_003_to_dataframe (self):
+        frame = self.dataset.to_dataframe()
+        self.assertEqual(frame.shape, (12, 16*2 + 2))
+        self.assertEqual(list(frame["mod_name"][:3]), ["bpsk", "qpsk", "8psk"])
+        self.assertEqual(frame[1][5], self.dataset.iq[5, 0].imag)
+
+    def test_004_npz (self):
+        path = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(path, "dataset.npz")
+            self.dataset.save(filename)
+            loaded = iq_dataset.load(filename)
+        finally:
+            shutil.rmtree(path)
+        self.assertTrue(np.array_equal(loaded.iq, self.dataset.iq))
+        self.assertTrue(np.array_equal(loaded.label, self.dataset.label))
+        self.assertTrue(np.array_equal(loaded.snr_db, self.dataset.snr_db))
+        self.assertEqual(loaded.mod_names, self.dataset.mod_names)
+        self.assertEqual(loaded.iq.dtype, np.complex64)
+        self.assertEqual(loaded.snr_db.dtype, np.int8)
+
+    def test_005_select_name (self):
+        # A string is one name, not a sequence of one letter names
+        subset = self.dataset.select("qpsk")
+        self.assertEqual(list(subset.mod_name), ["qpsk"]*4)
+        self.assertTrue(np.array_equal(subset.iq, self.dataset.iq[1::3]))
+        self.assertRaises(KeyError, self.dataset.select, "16qam")
+
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_iq_dataset, "qa_iq_dataset.xml")
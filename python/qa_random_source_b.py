@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 
+# Copyright 2018 University of Arizona.
+# 
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+# 
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+# 
+
+from gnuradio import gr, gr_unittest
+from gnuradio import blocks
+import classify_swig as classify
+import numpy as np
+
+class qa_random_source_b (gr_unittest.TestCase):
+
+    def run_source (self, seed, n, max_noutput_items=None):
+        tb = gr.top_block()
+        src = classify.random_source_b(seed)
+        if max_noutput_items is not None:
+            src.set_max_noutput_items(max_noutput_items)
+        head = blocks.head(gr.sizeof_char, n)
+        snk = blocks.vector_sink_b()
+        tb.connect(src, head, snk)
+        tb.run()
+        return np.array(snk.data(), dtype=np.uint8)
+
+    def test_001_seeded (self):
+        a = self.run_source(1234, 100003)
+        b = self.run_source(1234, 100003)
+        c = self.run_source(4321, 100003)
+        self.assertEqual(len(a), 100003)
+        self.assertTrue(np.array_equal(a, b))
+        self.assertFalse(np.array_equal(a, c))
+
+    def test_002_uniform (self):
+        data = self.run_source(0, 1 << 20)
+        counts = np.bincount(data, minlength=256)
+        expected = len(data) / 256.0
+        self.assertTrue(np.all(np.abs(counts - expected) < 6*np.sqrt(expected)))
+
+    def test_003_chunking (self):
+        # Odd buffer sizes split words across work() calls
+        a = self.run_source(77, 100003)
+        for max_noutput_items in (3, 7, 1001):
+            self.assertTrue(np.array_equal(self.run_source(77, 100003, max_noutput_items), a))
+        for n in (1, 5, 4099):
+            self.assertTrue(np.array_equal(self.run_source(77, n), a[:n]))
+        # The same MT19937 words as numpy, least significant byte first
+        words = np.random.RandomState(77).randint(0, 2**32, size=25001, dtype=np.uint32)
+        self.assertTrue(np.array_equal(words.astype('<u4').view(np.uint8)[:100003], a))
+
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_random_source_b, "qa_random_source_b.xml")
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 
+# Copyright 2018 University of Arizona.
+# 
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+# 
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+# 
+
+from gnuradio import gr_unittest
+from classify import sigmf_io
+from classify.generate_dataset import extract_exemplars, generate_dataset
+from classify.sigmf_io import recording_base, recordings_to_dataset, sigmf_recording, write_meta
+import json
+import numpy as np
+import shutil
+import tempfile
+
+class qa_sigmf_io (gr_unittest.TestCase):
+
+    def setUp (self):
+        self.path = tempfile.mkdtemp()
+        self.rng = np.random.RandomState(0)
+
+    def tearDown (self):
+        shutil.rmtree(self.path)
+
+    def record (self, tx_key, snr_db, num_samples=4000, mod_names=None):
+        # A cf32_le recording as the file sink of capture_sweep writes it
+        data = (self.rng.randn(num_samples) + 1j*self.rng.randn(num_samples)).astype(np.complex64)
+        base = recording_base(self.path, tx_key, "awgn", snr_db)
+        data.tofile(base + ".sigmf-data")
+        write_meta(base, tx_key, "awgn", snr_db, mod_names=mod_names)
+        return base, data
+
+    def test_001_meta (self):
+        base, data = self.record("bpsk", -2.5, mod_names=["qpsk", "bpsk"])
+        self.assertTrue(base.endswith("bpsk_awgn_-2.5dB"))
+        with open(base + ".sigmf-meta") as f:
+            meta = json.load(f)
+        info = meta["global"]
+        self.assertEqual(info["core:version"], sigmf_io.sigmf_version)
+        self.assertEqual(info["core:datatype"], "cf32_le")
+        self.assertTrue("-2.5 dB" in info["core:description"])
+        self.assertEqual(info["classify:snr_db"], -2.5)
+        self.assertEqual(info["classify:mod_names"], ["qpsk", "bpsk"])
+        # Every namespace in use has to be core or declared as an extension
+        declared = set(["core"]) | set(ext["name"] for ext in info["core:extensions"])
+        used = set(key.split(":")[0] for key in info)
+        for capture in meta["captures"]:
+            used |= set(key.split(":")[0] for key in capture)
+        self.assertEqual(used - declared, set())
+        self.assertEqual(info["core:extensions"],
+                         [{"name": "classify", "version": sigmf_io.extension_version, "optional": True}])
+
+    def test_002_exemplars (self):
+        base, data = self.record("bpsk", 10)
+        recording = sigmf_recording(base + ".sigmf-meta")
+        self.assertEqual(len(recording), 4000)
+        self.assertEqual((recording.tx_key, recording.channel_type, recording.snr_db), ("bpsk", "awgn", 10))
+        exemplars = recording.exemplars(64, 8, np.random.RandomState(3))
+        # Offsets as the sampler of generate_job draws them
+        offsets = np.cumsum(np.random.RandomState(3).randint(128, 256, size=(8,))) + 500
+        expected = extract_exemplars(data, offsets, np.empty((8, 64, 2), dtype=np.float32))
+        self.assertTrue(np.array_equal(exemplars, expected))
+        self.assertRaises(ValueError, recording.exemplars, 64, 100)
+
+    def test_003_dataset (self):
+        # File name order (bpsk, qpsk) differs from the stored label table
+        mod_names = ["qpsk", "16qam", "bpsk"]
+        recordings = dict(((tx_key, snr_db), self.record(tx_key, snr_db, mod_names=mod_names)[1])
+                          for tx_key in ("bpsk", "qpsk") for snr_db in (0, 10))
+        dataset = recordings_to_dataset(self.path, 32, 5, np.random.RandomState(1))
+        self.assertEqual(dataset.mod_names, mod_names)
+        self.assertEqual(len(dataset), 20)
+        rng = np.random.RandomState(1)
+        for start in range(0, 20, 5):
+            rows = slice(start, start + 5)
+            tx_key, snr_db = dataset.mod_name[start], int(dataset.snr_db[start])
+            self.assertEqual(list(dataset.mod_name[rows]), [tx_key]*5)
+            self.assertEqual(list(dataset.label[rows]), [mod_names.index(tx_key)]*5)
+            offsets = np.cumsum(rng.randint(64, 128, size=(5,))) + 500
+            expected = extract_exemplars(recordings[(tx_key, snr_db)], offsets,
+                                         np.empty((5, 32, 2), dtype=np.float32))
+            self.assertTrue(np.array_equal(dataset.iq[rows], expected.view(np.complex64)[:, :, 0]))
+
+    def test_004_registry_order (self):
+        # Recordings without a label table are ordered like tx_registry
+        self.record("wbfm", 0)
+        self.record("bpsk", 0)
+        dataset = recordings_to_dataset(self.path, 32, 2)
+        self.assertEqual(dataset.mod_names, ["bpsk", "wbfm"])
+        self.record("qpsk", 0, mod_names=["qpsk"])
+        self.record("16qam", 0, mod_names=["16qam", "qpsk"])
+        self.assertRaises(ValueError, recordings_to_dataset, self.path, 32, 2)
+
+    def test_005_capture_sweep (self):
+        # The file sinks of capture_sweep record every (tx, snr) capture
+        params = dict(snr_vals=[0, 10], num_cplx_samples=32, num_exemplars_per_key=2,
+                      dataset="small", seed=5, share_tx=True, as_frame=False)
+        dataset = generate_dataset(record_path=self.path, **params)
+        recorded = recordings_to_dataset(self.path, 32, 2)
+        self.assertEqual(recorded.mod_names, dataset.mod_names)
+        self.assertEqual(len(recorded), len(dataset))
+        for mod_name in dataset.mod_names:
+            for snr_db in params["snr_vals"]:
+                recording = sigmf_recording(recording_base(self.path, mod_name, "awgn", snr_db))
+                self.assertEqual(len(recording), 5*32*2 + 500)
+                self.assertEqual(recording.mod_names, dataset.mod_names)
+                rows = (recorded.mod_name == mod_name) & (recorded.snr_db == snr_db)
+                self.assertEqual(rows.sum(), 2)
+                self.assertTrue(np.all(recorded.label[rows] == dataset.mod_names.index(mod_name)))
+
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_sigmf_io, "qa_sigmf_io.xml")
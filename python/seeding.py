@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 
+# Copyright 2018 University of Arizona.
+# 
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+# 
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+# 
+
+'''
+Seed hierarchy for reproducible generation. A master seed is split into
+child seeds keyed by (tx, shard, snr) indices, so a job gets the same
+seeds no matter which process runs it or in which order.
+'''
+
+import numpy as np
+
+try:
+    from numpy.random import SeedSequence
+except ImportError:
+    # numpy < 1.17, hash the key with the array seeding of RandomState
+    SeedSequence = None
+
+
+def child_seeds(seed, key, n):
+    '''
+    n seeds in [1, 2**31 - 1] derived from the master seed and key, a tuple
+    of non-negative ints. The first words do not depend on n. Zero is never
+    returned since GNU Radio blocks treat a zero seed specially.
+    '''
+    if SeedSequence is not None:
+        state = SeedSequence(seed, spawn_key=tuple(key)).generate_state(n)
+    else:
+        state = np.random.RandomState([seed] + list(key)).randint(0, 2**31 - 1, size=n)
+    return [int(word) % (2**31 - 1) + 1 for word in state]
+
+
+class job_seeds(object):
+    '''
+    Seeds of one job, a transmitter capture of shard `shard` at the SNRs
+    with indices snr_indices. tx_seed drives the payload of the transmitter
+    and sampler_seed the exemplar offsets (or, for the numpy engine, the
+    whole channel sweep). channel_seeds has one (noise_seed, fading_seed)
+    per SNR and only depends on (tx, shard, snr), so the channel of an SNR
+    is the same whether the job covers one SNR or the whole sweep.
+    '''
+    def __init__(self, seed, idx_tx, shard, snr_indices):
+        self.tx_seed, self.sampler_seed = \
+            child_seeds(seed, (idx_tx, shard) + tuple(snr_indices), 2)
+        self.channel_seeds = [
+            tuple(child_seeds(seed, (idx_tx, shard, idx_snr), 4)[2:])
+            for idx_snr in snr_indices
+        ]
+
+    def sampler(self):
+        return np.random.RandomState(self.sampler_seed)
+
+    def tx_rng(self):
+        return np.random.RandomState(self.tx_seed)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 
+# Copyright 2018 University of Arizona.
+# 
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+# 
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+
+'''
+SigMF recordings of the raw channel output of generate_dataset. Every
+(transmitter, channel, SNR) capture is a .sigmf-data file of cf32_le samples
+written by a file sink while the flowgraph runs, next to a .sigmf-meta
+JSON file. sigmf_recording memory maps a recording and cuts exemplars of
+any length from it again.
+'''
+
+from classify.iq_dataset import iq_dataset
+import numpy as np
+import glob
+import json
+import os
+
+# SigMF specification written to core:version, and the version of the
+# classify: namespace declared in core:extensions
+sigmf_version = "1.2.0"
+extension_version = "1.0.0"
+
+
+def recording_base(path, tx_key, channel_type, snr_db):
+    '''
+    Recording path without extension for one capture
+    '''
+    return os.path.join(path, "%s_%s_%gdB" % (tx_key, channel_type or "none", snr_db))
+
+
+def write_meta(base, tx_key, channel_type, snr_db, seeds=None, mod_names=None):
+    '''
+    Writes base.sigmf-meta for the cf32_le samples in base.sigmf-data. The
+    dataset fields live in the optional classify: extension. mod_names is
+    the label table of the generating dataset, so recordings_to_dataset
+    gives tx_key the same label code as generate_dataset.
+    '''
+    meta = {
+        "global": {
+            "core:datatype": "cf32_le",
+            "core:version": sigmf_version,
+            "core:extensions": [
+                {"name": "classify", "version": extension_version, "optional": True}
+            ],
+            "core:description": "%s through %s at %g dB SNR" % (tx_key, channel_type or "no channel", snr_db),
+            "classify:tx": tx_key,
+            "classify:channel": channel_type,
+            "classify:snr_db": snr_db
+        },
+        "captures": [{"core:sample_start": 0}],
+        "annotations": []
+    }
+    if seeds is not None:
+        meta["global"]["classify:tx_seed"] = seeds.tx_seed
+    if mod_names is not None:
+        meta["global"]["classify:mod_names"] = list(mod_names)
+    with open(base + ".sigmf-meta", "w") as f:
+        json.dump(meta, f, indent=2)
+
+
+class sigmf_recording(object):
+    '''
+    One recording, opened from its path with or without extension. The
+    samples are a read-only memory map, so opening is cheap.
+    '''
+    def __init__(self, base):
+        root, ext = os.path.splitext(base)
+        if ext in (".sigmf-meta", ".sigmf-data"):
+            base = root
+        with open(base + ".sigmf-meta") as f:
+            self.meta = json.load(f)
+        info = self.meta["global"]
+        if info["core:datatype"] != "cf32_le":
+            raise ValueError("Unsupported SigMF datatype: %s" % info["core:datatype"])
+        self.tx_key = info["classify:tx"]
+        self.channel_type = info["classify:channel"]
+        self.snr_db = info["classify:snr_db"]
+        self.mod_names = info.get("classify:mod_names")
+        self.data = np.memmap(base + ".sigmf-data", dtype=np.complex64, mode="r")
+
+    def __len__(self):
+        return len(self.data)
+
+    def exemplars(self, num_cplx_samples, num_exemplars, rng=None):
+        '''
+        Cuts num_exemplars windows of num_cplx_samples with the sampler of
+        generate_job (random gaps after the channel transients) and returns
+        them energy normalized as float32 of shape
+        (num_exemplars, num_cplx_samples, 2).
+        '''
+        # Imported here, generate_dataset itself imports this module
+        from classify.generate_dataset import extract_exemplars
+        rng = np.random if rng is None else rng
+        offsets = np.cumsum(rng.randint(2*num_cplx_samples, 4*num_cplx_samples, size=(num_exemplars,))) + 500
+        if len(offsets) and offsets[-1] + num_cplx_samples > len(self.data):
+            raise ValueError("%d exemplars of %d samples do not fit in %d samples"
+                             % (num_exemplars, num_cplx_samples, len(self.data)))
+        out = np.empty((num_exemplars, num_cplx_samples, 2), dtype=np.float32)
+        return extract_exemplars(self.data, offsets, out)
+
+
+def load_recordings(path):
+    '''
+    All recordings under path, ordered by file name
+    '''
+    return [sigmf_recording(meta) for meta in sorted(glob.glob(os.path.join(path, "*.sigmf-meta")))]
+
+
+def recordings_to_dataset(path, num_cplx_samples, num_exemplars_per_key, rng=None):
+    '''
+    Re-windows every recording under path into an iq_dataset without
+    regenerating anything. The label table is the one stored with the
+    recordings, as generate_dataset used it; recordings without one fall
+    back to the order of tx_registry.
+    '''
+    recordings = load_recordings(path)
+    tables = set(tuple(r.mod_names) for r in recordings if r.mod_names is not None)
+    if len(tables) > 1:
+        raise ValueError("Recordings under %s come from different datasets" % path)
+    if tables:
+        mod_names = list(tables.pop())
+    else:
+        from classify.generate_dataset import tx_registry
+        tx_keys = set(r.tx_key for r in recordings)
+        mod_names = [tx_key for tx_key in tx_registry if tx_key in tx_keys]
+        mod_names += sorted(tx_keys - set(mod_names))
+    iq = np.empty((len(recordings)*num_exemplars_per_key, num_cplx_samples, 2), dtype=np.float32)
+    for idx, recording in enumerate(recordings):
+        start = idx*num_exemplars_per_key
+        iq[start:start + num_exemplars_per_key] = \
+            recording.exemplars(num_cplx_samples, num_exemplars_per_key, rng)
+    label = np.repeat([mod_names.index(r.tx_key) for r in recordings], num_exemplars_per_key).astype(np.int16)
+    snr_db = np.repeat([r.snr_db for r in recordings], num_exemplars_per_key)
+    return iq_dataset(iq.view(np.complex64)[:, :, 0], label, mod_names, snr_db)
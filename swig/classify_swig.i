@@ -9,8 +9,11 @@
 
 %{
 #include "classify/cpfsk_bc.h"
+#include "classify/random_source_b.h"
 %}
 
 
 %include "classify/cpfsk_bc.h"
 GR_SWIG_BLOCK_MAGIC2(classify, cpfsk_bc);
+%include "classify/random_source_b.h"
+GR_SWIG_BLOCK_MAGIC2(classify, random_source_b);